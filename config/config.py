@@ -2,6 +2,16 @@ EXTRA_FIELD = ["外销合同", "船代公司", "费用名称", "货币代码", "
 SUBMIT_FIELD = ["外销合同", "船代公司", "费用名称", "货币代码", "金额", "备注"]
 HISTORY_FIELD = ["外销合同", "船代公司", "费用名称", "货币代码", "金额", "上传情况"]
 
+# Excel 转图片的方式："excel2img" 通过 Excel 导出；"spire" 使用 Spire.XLS 在进程内渲染。
+# 注意：免费版/未授权的 Spire.XLS 会在渲染的图片上加入 "Evaluation Warning" 水印文字，
+# 这些图片会直接发送给大模型识别，可能干扰提取结果；只有安装了正式授权时才应切换为 "spire"
+EXCEL_IMAGE_RENDERER = "excel2img"
+
+# 非扁平式 Excel 的数据提取方式："markdown" 先识别为 Markdown（多个sheet合并为一次请求），
+# 再由文本模型转换为 JSON；"json" 由多模态模型直接输出结构化数据（单次调用），
+# 该提示词尚未在真实表格上验证，验证前默认使用 "markdown"
+EXCEL_EXTRACTION_MODE = "markdown"
+
 # 票据结构纠正提示词
 CORRECTION_PROMPT = """
 
@@ -518,3 +528,87 @@ EXCEL_TABLE_EXTRACTION_PROMPT = """
 
 现在请开始识别图片中的所有内容，严格按照以上规则输出（包括表格前的文本、Markdown表格、表格后的文本）。
 """
+
+# 多个工作表合并为一次请求提取数据时追加的提示词，{count} 为工作表数量
+EXCEL_MULTI_SHEET_EXTRACTION_PROMPT = """
+# 多工作表批量识别要求
+
+本次输入包含 {count} 个工作表的截图，每个工作表的截图之前都有一行“工作表 N”的标注（N 为工作表序号）。
+请对每个工作表分别按照上述规则完整识别，并按工作表序号依次输出，格式如下：
+
+<<<SHEET 1>>>
+[工作表1的识别结果]
+
+<<<SHEET 2>>>
+[工作表2的识别结果]
+
+**格式规则：**
+1. 标记行中的序号必须与截图前标注的工作表序号一致
+2. 每个工作表必须输出且只输出一次，不要遗漏
+3. 标记行单独占一行，标记行之外不要添加任何说明文字
+4. 不同工作表的内容不能混在一起
+"""
+
+# 由多模态模型直接从 Excel 截图中提取费用明细 JSON 的提示词
+EXCEL_TABLE_JSON_EXTRACTION_PROMPT = """
+# 物流费用单结构化提取提示词
+
+## 核心任务
+你是一个专业的物流费用数据提取专家。请仔细阅读物流部费用单 Excel 截图（可能是同一张表格按行切分的多张截图，
+需要按顺序合并阅读），直接提取费用明细并输出纯 JSON。
+
+<重要>你的回复必须是纯 JSON 格式，不允许有任何其他内容</重要>
+
+## 输出格式（必须严格遵守）
+{
+    "费用明细": [
+        {
+            "外销合同": "字符串",
+            "船代公司": "字符串",
+            "费用名称": "字符串",
+            "货币代码": "字符串",
+            "金额": "字符串",
+            "备注": "字符串"
+        }
+    ]
+}
+
+## 输出要求（违反将视为失败）
+1. 只输出 JSON，不要输出任何解释、说明、思考过程
+2. 不要使用 Markdown 代码块标记（不要用 ```json 或 ```）
+3. 所有字段值都是字符串类型，包括金额
+4. 缺失的字段用空字符串 "" 填充
+5. 金额保留两位小数，格式如 "123.45"
+
+## 字段提取规则
+
+### 1. 外销合同
+查找委托编号、业务编号、合同号、工作单号、订舱号、提单号等对应的值，
+通常为字母+数字组合（如 SEAE25090135、D25DW02025B），优先选择表格中重复出现的编号。
+如果表格中每行都有各自的编号，则每条费用使用所在行的编号。
+
+### 2. 船代公司
+识别提供物流服务的公司，通常在表格标题或账户信息处：
+- 优先识别包含"物流"、"船务"、"货运"、"航运"、"船代"、"供应链"等关键词的公司
+- 排除标注为"委托方"、"货主"的公司，或纯"贸易"、"进出口"公司
+
+### 3. 费用名称
+- 去除行首编号（如 "1." "2."）和货币符号、括号（如 "场站费 (￥)" → "场站费"）
+- 保留完整的费用描述
+- 忽略"合计"、"小计"、"总计"等汇总行
+
+### 4. 货币代码
+根据金额所在列的表头或货币符号判断：￥ 或 RMB → CNY；$ 或 USD → USD；HKD → HKD；EUR → EUR；JPY → JPY。
+币种列与金额列必须严格对齐，不能混淆。
+
+### 5. 金额
+- 提取每行费用的合计金额（不是单价），同一行在多个币种列都有金额时，每个币种各生成一条费用
+- 去除货币符号、千分位逗号和空格，保留两位小数（800 → "800.00"）
+- 空值或"-"用 "0.00" 表示，负数保留负号
+- 注意区分易混淆字符：0 与 O、1 与 I、5 与 S、8 与 B、小数点与逗号
+
+### 6. 备注
+提取"备注"、"说明"、"Notes"列的内容，无内容则为空字符串 ""
+
+现在请开始提取，记住：只输出 JSON，不要有任何其他内容。
+"""
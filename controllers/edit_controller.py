@@ -3,28 +3,125 @@
 处理数据编辑相关的业务逻辑
 """
 
+import hashlib
 import json
 import os
-from typing import List, Dict, Any, Optional
-
-from PySide6.QtCore import QObject, Signal, Qt
-from PySide6.QtGui import QColor, QFont
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Iterator
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时使用标准库序列化
+    orjson = None
+from PySide6.QtCore import (
+    QObject,
+    QThread,
+    Signal,
+    QModelIndex,
+    Qt,
+)
 from PySide6.QtWidgets import (
-    QTableWidgetItem,
     QMenu,
     QAbstractItemView,
     QMessageBox,
     QInputDialog,
 )
 
-from config.config import EXTRA_FIELD
-from utils.common import generate_light_colors
 from utils.logger import get_error_logger, get_edit_logger, get_file_conversion_logger
 
 logger = get_file_conversion_logger()
 edit_logger = get_edit_logger()
 error_logger = get_error_logger()
 
+@lru_cache(maxsize=1)
+def _base_colors() -> tuple:
+    """返回浅色系颜色表，首次展示数据时才生成"""
+    from utils.common import generate_light_colors
+
+    return tuple(generate_light_colors())
+
+
+@lru_cache(maxsize=16)
+def _assign_pair_colors(pairs: tuple) -> Dict[tuple, str]:
+    """为 (外销合同, 货币代码) 组合分配颜色，相同的组合序列直接复用结果
+
+    Args:
+        pairs: 按首次出现顺序排列的唯一 (外销合同, 货币代码) 组合
+
+    Returns:
+        合同颜色映射字典（缓存共享，调用方不可修改）
+    """
+    colors = _base_colors()
+    n = len(colors)
+    contract_colors = {}
+    i = 0
+    # 按首次出现的顺序依次分配，空合同空币种的组合保持白色且不占用颜色
+    for pair in pairs:
+        if pair == ("", ""):
+            contract_colors[pair] = "#ffffff"
+        else:
+            contract_colors[pair] = colors[i % n]
+            i += 1
+    return contract_colors
+
+
+class TempSaveWorker(QThread):
+    """临时数据保存工作线程"""
+
+    # 信号：保存完成 (success, error_msg)
+    save_finished = Signal(bool, str)
+
+    def __init__(
+            self, data: List[Dict[str, Any]], temp_path: str,
+            last_hash: Optional[bytes] = None,
+    ):
+        super().__init__()
+        self.data = data
+        self.temp_path = temp_path
+        # 上次成功写入内容的摘要，内容相同时跳过写盘
+        self.last_hash = last_hash
+        self.payload_hash: Optional[bytes] = None
+        self.written = False
+
+    def run(self):
+        """将数据写入临时文件"""
+        try:
+            # 检查磁盘空间
+            try:
+                import shutil
+
+                free_space = shutil.disk_usage(os.path.dirname(self.temp_path)).free
+                if free_space < 1024 * 1024:  # 小于1MB
+                    self.save_finished.emit(False, "磁盘空间不足，无法保存数据")
+                    return
+            except Exception:
+                pass  # 如果检查失败，继续尝试保存
+
+            if orjson is not None:
+                payload = orjson.dumps(self.data)
+            else:
+                payload = json.dumps(
+                    self.data, ensure_ascii=False, separators=(",", ":")
+                ).encode("utf-8")
+
+            payload_hash = hashlib.blake2b(payload, digest_size=16).digest()
+            self.payload_hash = payload_hash
+            if payload_hash == self.last_hash and os.path.exists(self.temp_path):
+                self.save_finished.emit(True, "")
+                return
+
+            # 先写入临时文件再原子替换，保存中断时不会留下不完整的数据文件
+            tmp_path = self.temp_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.temp_path)
+            self.written = True
+            self.save_finished.emit(True, "")
+        except Exception as e:
+            self.save_finished.emit(False, f"保存数据失败: {str(e)}")
+
+
 class EditController(QObject):
     """编辑功能控制器
 
@@ -51,22 +148,47 @@ class EditController(QObject):
         self.data_manager = data_manager
         self.view._controller = self
         self.data: Optional[List[Dict[str, Any]]] = None
-        self.current_data: Optional[List[Dict[str, Any]]] = None
-        self.edit_tracking_enabled = False  # 编辑跟踪开关
+        self._save_worker: Optional[TempSaveWorker] = None
+        # 上次写入临时文件的数据摘要
+        self._last_saved_hash: Optional[bytes] = None
+        # 源文件列的列号，点击时只需比较整数
+        self._source_col = self.view.table_model.source_column()
+        # 上次渲染或交给数据管理器的行数据，用于跳过重复渲染
+        self._rendered_rows: Optional[List[Dict[str, Any]]] = None
+        # 表格在上次渲染或同步之后是否被修改过
+        self._dirty = True
+        # 右键菜单及其作用的行、选中数据
+        self._ctx_menu: Optional[QMenu] = None
+        self._ctx_row = -1
+        self._ctx_selected_rows: set = set()
+        self._ctx_operate_data: List = []
         self._connect_signals()
 
     def _connect_signals(self) -> None:
         """连接视图信号"""
-        self.view.finish_button.clicked.connect(self._on_finish_clicked)
-        self.view.temp_save_button.clicked.connect(self._on_temp_save_clicked)
-        self.view.data_table.customContextMenuRequested.connect(
-            self._on_context_menu_requested
+        view = self.view
+        table = view.data_table
+        model = view.table_model
+        # 视图信号都在界面线程中发出，直接调用槽函数
+        direct = Qt.DirectConnection
+        view.finish_button.clicked.connect(self._on_finish_clicked, direct)
+        view.temp_save_button.clicked.connect(self._on_temp_save_clicked, direct)
+        table.customContextMenuRequested.connect(
+            self._on_context_menu_requested, direct
         )
-        self.view.data_table.cellClicked.connect(self._on_cell_clicked)
-        self.view.data_table.itemChanged.connect(self._on_item_changed)
+        table.clicked.connect(self._on_cell_clicked, direct)
+        model.cell_edited.connect(self._on_cell_edited, direct)
+        # 表格内容变化后，再次展示时需要重新计算颜色
+        model.dataChanged.connect(self._invalidate_rendered, direct)
+        model.rowsInserted.connect(self._invalidate_rendered, direct)
+        model.rowsRemoved.connect(self._invalidate_rendered, direct)
         # 设置表格支持多选
-        self.view.data_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.view.data_table.setSelectionBehavior(QAbstractItemView.SelectItems)
+        table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        table.setSelectionBehavior(QAbstractItemView.SelectItems)
+        # 使表格可编辑
+        table.setEditTriggers(
+            QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed
+        )
 
     def update_filename(self, filename_str: str) -> None:
         """更新文件名显示
@@ -76,6 +198,56 @@ class EditController(QObject):
         """
         self.view.filename_label.setText(f"文件名: {filename_str}")
 
+    @contextmanager
+    def _bulk_update(self) -> Iterator[None]:
+        """批量修改表格时暂停重绘和排序
+
+        整个批量操作结束后只重绘一次，避免每次增删行都刷新界面。
+        """
+        table = self.view.data_table
+        sorting_enabled = table.isSortingEnabled()
+        table.setUpdatesEnabled(False)
+        table.setSortingEnabled(False)
+        try:
+            yield
+        finally:
+            table.setSortingEnabled(sorting_enabled)
+            table.setUpdatesEnabled(True)
+
+    def _set_cells(self, indexes: List[QModelIndex], value: str) -> None:
+        """批量设置单元格的值
+
+        逐个写入时不发出通知，结束后只发出一次 dataChanged 通知视图刷新。
+        与单元格编辑一致，写入前去除首尾空白。
+
+        Args:
+            indexes: 要修改的单元格索引
+            value: 新值
+        """
+        if not indexes:
+            return
+        model = self.view.table_model
+        write_value = model.write_value
+        value = value.strip()
+        min_row = min_col = float("inf")
+        max_row = max_col = -1
+        for index in indexes:
+            row = index.row()
+            col = index.column()
+            write_value(row, col, value)
+            # 同时计算修改范围的外接矩形
+            if row < min_row:
+                min_row = row
+            if row > max_row:
+                max_row = row
+            if col < min_col:
+                min_col = col
+            if col > max_col:
+                max_col = col
+        model.dataChanged.emit(
+            model.index(min_row, min_col), model.index(max_row, max_col)
+        )
+
     def data_display(self, data: List[Dict[str, Any]]) -> None:
         """界面中的数据展示
 
@@ -84,168 +256,91 @@ class EditController(QObject):
         """
         data_list = data
         if not data_list:
-            self.view.data_table.setRowCount(0)
-            self.view.data_table.setColumnCount(0)
+            # 清空已有的行，表头由模型固定提供，无需重建
+            self._rendered_rows = None
+            if self.view.table_model.rowCount():
+                self.view.table_model.set_rows([], [])
             return
 
-        self.current_data = data_list.copy()  # 保存当前数据的副本
-
-        # 设置表格行数和列数
-        self.view.data_table.setRowCount(len(data_list))
-        self.view.data_table.setColumnCount(len(EXTRA_FIELD))
-        self.view.data_table.setHorizontalHeaderLabels(EXTRA_FIELD)
-
-        # 使表格可编辑
-        self.view.data_table.setEditTriggers(
-            QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed
-        )
+        # 数据就是上次渲染或同步的那份，且表格之后未被修改过，无需重新填充
+        if data_list is self._rendered_rows and not self._dirty:
+            return
 
         # 为不同的外销合同分配颜色
-        contract_colors = self._generate_contract_colors(data_list)
+        row_colors = self._generate_contract_colors(data_list)
 
-        # 按照EXTRA_FIELD中的顺序填充表格数据
-        self.edit_tracking_enabled = False  # 填充数据时禁用跟踪
-        self._populate_table_data(data_list, contract_colors)
-        self.edit_tracking_enabled = True  # 填充完成后启用跟踪
+        # 按照EXTRA_FIELD中的顺序填充表格模型，视图只渲染可见的单元格，
+        # 填充期间暂停重绘，模型重置后只刷新一次
+        with self._bulk_update():
+            self.view.table_model.set_rows(data_list, row_colors)
+        self._rendered_rows = data_list
+        self._dirty = False
 
-    def _populate_table_data(
-            self, data_list: List[Dict[str, Any]], contract_colors: Dict[tuple, str]
-    ) -> None:
-        """填充表格数据
-
-        Args:
-            data_list: 数据列表
-            contract_colors: 合同颜色映射
-        """
-        for row, data_row in enumerate(data_list):
-            contract_value = data_row.get("外销合同", "")
-            currency_value = data_row.get("货币代码", "")
-            key = (contract_value, currency_value)
-            background_color = contract_colors.get(key, "#ffffff")
-
-            for col, field in enumerate(EXTRA_FIELD):
-                # 字段值
-                value = str(
-                    data_row.get(field, "")
-                )  # 获取对应值，如果不存在则为空字符串
-                value_item = QTableWidgetItem(value)
-                value_item.setFlags(
-                    value_item.flags() | Qt.ItemIsEditable
-                )  # 设置为可编辑
-
-                # 设置背景颜色
-                value_item.setBackground(QColor(background_color))
-
-                # 源文件列特殊样式
-                if field == "源文件":
-                    self._style_source_file_cell(value_item)
-
-                self.view.data_table.setItem(row, col, value_item)
-
-    def _style_source_file_cell(self, item: QTableWidgetItem) -> None:
-        """设置源文件单元格样式
-
-        Args:
-            item: 表格项
-        """
-        font = QFont()
-        font.setUnderline(True)
-        item.setFont(font)
-        item.setForeground(Qt.blue)
+    def _invalidate_rendered(self, *args) -> None:
+        """表格数据被修改后，标记下次展示时需要重新渲染"""
+        self._dirty = True
 
     def _generate_contract_colors(
             self, data_list: List[Dict[str, Any]]
-    ) -> Dict[tuple, str]:
-        """为不同的外销合同+货币代码组合生成颜色映射
+    ) -> List[str]:
+        """为不同的外销合同+货币代码组合生成颜色，并按行展开
 
         Args:
             data_list: 数据列表
 
         Returns:
-            合同颜色映射字典
+            与数据行一一对应的背景色列表
         """
-        # 获取所有唯一的 (外销合同, 货币代码) 组合
-        contract_currency_pairs = set()
-        for data_row in data_list:
-            contract = data_row.get("外销合同", "")
-            currency = data_row.get("货币代码", "")
-            key = (contract, currency)
-            contract_currency_pairs.add(key)
-
-        colors = generate_light_colors()
-        # 为每个 (外销合同, 货币代码) 组合分配颜色
-        contract_colors = {}
-        pair_list = sorted(list(contract_currency_pairs))  # 排序确保一致性
-
-        for i, (contract, currency) in enumerate(pair_list):
-            if contract == "" and currency == "":
-                contract_colors[(contract, currency)] = "#ffffff"
-            else:
-                contract_colors[(contract, currency)] = colors[i % len(colors)]
-
-        return contract_colors
-
-    def _on_item_changed(self, item: QTableWidgetItem) -> None:
-        """处理单元格内容变化事件
+        # 每行的 (外销合同, 货币代码) 组合
+        row_keys = [
+            (data_row.get("外销合同", ""), data_row.get("货币代码", ""))
+            for data_row in data_list
+        ]
+        # 一次遍历去重并保持顺序，为每个唯一的组合分配颜色
+        contract_colors = _assign_pair_colors(tuple(dict.fromkeys(row_keys)))
+        return [contract_colors[key] for key in row_keys]
+
+    def _on_cell_edited(self, row: int, col: int, old_value: str, new_value: str) -> None:
+        """处理用户编辑单元格事件
 
         Args:
-            item: 被修改的表格项
+            row: 行号
+            col: 列号
+            old_value: 原值
+            new_value: 新值
         """
-        if not self.edit_tracking_enabled:
-            return
-
         try:
-            row = item.row()
-            col = item.column()
-            new_value = item.text()
-
-            # 获取字段名
-            header_item = self.view.data_table.horizontalHeaderItem(col)
-            field_name = header_item.text() if header_item else f"列{col}"
+            model = self.view.table_model
+            field_name = model.field_name(col)
 
             # 获取外销合同号（第0列）
-            contract_item = self.view.data_table.item(row, 0)
-            contract_value = contract_item.text() if contract_item else ""
-
-            # 从原始数据中获取旧值
-            old_value = ""
-            if self.current_data and row < len(self.current_data):
-                old_value = str(self.current_data[row].get(field_name, ""))
-
-            col_count = self.view.data_table.columnCount()
-            last_col_index = col_count - 1
-            original_file_item = self.view.data_table.item(row, last_col_index)
-            original_file_value = original_file_item.text() if original_file_item else ""
-
-            # 只记录真正发生变化的修改
-            if old_value != new_value:
-                edit_info = {
-                    "外销合同号": contract_value,
-                    "字段": field_name,
-                    "原值": old_value,
-                    "新值": new_value,
-                    "源文件": original_file_value,
-                }
-                edit_logger.info(f"用户编辑单元格: {edit_info}")
+            contract_value = model.value(row, 0)
+
+            original_file_value = model.value(row, self._source_col)
+
+            edit_info = {
+                "外销合同号": contract_value,
+                "字段": field_name,
+                "原值": old_value,
+                "新值": new_value,
+                "源文件": original_file_value,
+            }
+            edit_logger.info(f"用户编辑单元格: {edit_info}")
 
         except Exception as e:
             error_logger.error(f"跟踪单元格修改时出错: {str(e)}")
 
-    def _on_cell_clicked(self, row: int, column: int) -> None:
+    def _on_cell_clicked(self, index: QModelIndex) -> None:
         """处理单元格点击事件
 
         Args:
-            row: 行号
-            column: 列号
+            index: 被点击单元格的索引
         """
-        # 获取列标题
-        header_item = self.view.data_table.horizontalHeaderItem(column)
-        if not header_item:
+        # 只处理"源文件"列的点击
+        column = index.column()
+        if column != self._source_col or not index.isValid():
             return
-        column_name = header_item.text()
-        # 检查是否点击了"源文件"列
-        if column_name == "源文件":
-            self._handle_source_file_click(row, column)
+        self._handle_source_file_click(index.row(), column)
 
     def _handle_source_file_click(self, row: int, column: int) -> None:
         """处理源文件列点击
@@ -256,40 +351,18 @@ class EditController(QObject):
         """
         try:
             # 获取该行的源文件值
-            item = self.view.data_table.item(row, column)
-            if not item:
+            model = self.view.table_model
+            if not 0 <= row < model.rowCount():
                 QMessageBox.warning(self.view, "警告", "无法获取源文件信息")
                 return
-            source_file = item.text().strip()
+            source_file = model.value(row, column).strip()
             if not source_file:
                 QMessageBox.warning(self.view, "警告", "源文件路径为空")
                 return
-            if os.path.exists(source_file):
-                try:
-                    os.startfile(source_file)
-                except Exception as e:
-                    error_msg = f"无法打开文件: {str(e)}\n\n可能原因：\n1. 文件被其他程序占用\n2. 没有安装对应的程序\n3. 文件权限不足"
-                    reply = QMessageBox.critical(
-                        self.view,
-                        "打开文件失败",
-                        error_msg + "\n\n是否要在文件管理器中显示该文件？",
-                        QMessageBox.Yes | QMessageBox.No,
-                    )
-                    if reply == QMessageBox.Yes:
-                        try:
-                            # 在文件管理器中显示文件
-                            import subprocess
-
-                            subprocess.run(
-                                ["explorer", "/select,", os.path.normpath(source_file)]
-                            )
-                        except Exception as explorer_error:
-                            QMessageBox.warning(
-                                self.view,
-                                "错误",
-                                f"无法打开文件管理器: {str(explorer_error)}",
-                            )
-            else:
+            # 直接尝试打开文件，由异常区分文件不存在和打开失败，省去一次 stat
+            try:
+                os.startfile(source_file)
+            except FileNotFoundError:
                 reply = QMessageBox.warning(
                     self.view,
                     "文件不存在",
@@ -297,11 +370,32 @@ class EditController(QObject):
                     QMessageBox.Yes | QMessageBox.No,
                 )
                 if reply == QMessageBox.Yes:
-                    item.setText("")  # 清空源文件路径
-                    self._collect_current_data()  # 更新数据
+                    model.set_value(row, column, "")  # 清空源文件路径
                     QMessageBox.information(
                         self.view, "提示", "已清空该记录的源文件路径"
                     )
+            except Exception as e:
+                error_msg = f"无法打开文件: {str(e)}\n\n可能原因：\n1. 文件被其他程序占用\n2. 没有安装对应的程序\n3. 文件权限不足"
+                reply = QMessageBox.critical(
+                    self.view,
+                    "打开文件失败",
+                    error_msg + "\n\n是否要在文件管理器中显示该文件？",
+                    QMessageBox.Yes | QMessageBox.No,
+                )
+                if reply == QMessageBox.Yes:
+                    try:
+                        # 在文件管理器中显示文件，不等待资源管理器进程结束
+                        import subprocess
+
+                        subprocess.Popen(
+                            ["explorer", "/select,", os.path.normpath(source_file)]
+                        )
+                    except Exception as explorer_error:
+                        QMessageBox.warning(
+                            self.view,
+                            "错误",
+                            f"无法打开文件管理器: {str(explorer_error)}",
+                        )
 
         except Exception as e:
             QMessageBox.critical(
@@ -314,61 +408,70 @@ class EditController(QObject):
         Args:
             pos: 鼠标位置
         """
-        item = self.view.data_table.itemAt(pos)
-        if not item:
+        index = self.view.data_table.indexAt(pos)
+        if not index.isValid():
             return
 
-        row = item.row()
-        menu = QMenu(self.view)
+        if self._ctx_menu is None:
+            self._build_context_menu()
+
+        # 获取当前选中的项，记录到属性中供菜单动作使用
+        selected_items = self.view.data_table.selectionModel().selectedIndexes()
+        self._ctx_row = index.row()
+        self._ctx_operate_data = self._get_selected_rows(selected_items)
+        # 获取选中单元格涉及的所有行
+        self._ctx_selected_rows = set(index.row() for index in selected_items)
+
+        # 如果选中了多个单元格，显示批量操作选项，否则显示删除此行
+        multi_selected = len(selected_items) > 1
+        self._ctx_batch_edit.setText(f"批量修改所选单元格 ({len(selected_items)}个)")
+        self._ctx_batch_edit.setVisible(multi_selected)
+        self._ctx_separator.setVisible(multi_selected)
+        # 如果涉及多行，显示删除多行选项
+        self._ctx_delete_rows.setText(
+            f"删除所选单元格对应的行 ({len(self._ctx_selected_rows)}行)"
+        )
+        self._ctx_delete_rows.setVisible(
+            multi_selected and len(self._ctx_selected_rows) > 1
+        )
+        self._ctx_delete.setVisible(not multi_selected)
 
-        # 获取当前选中的项
-        selected_items = self.view.data_table.selectedItems()
-        operate_data = self._get_selected_rows(selected_items)
-        if len(selected_items) > 1:
-            # 如果选中了多个单元格，添加批量操作选项
-            batch_edit_action = menu.addAction(
-                f"批量修改所选单元格 ({len(selected_items)}个)"
-            )
-            batch_clear_action = menu.addAction("清空所选单元格")
-            batch_edit_action.triggered.connect(self._batch_edit_cells)
-            batch_clear_action.triggered.connect(self._batch_clear_cells)
-            menu.addSeparator()
-
-            # 获取选中单元格涉及的所有行
-            selected_rows = set(item.row() for item in selected_items)
-
-            if len(selected_rows) > 1:
-                # 如果涉及多行，显示删除多行选项
-                delete_rows_action = menu.addAction(
-                    f"删除所选单元格对应的行 ({len(selected_rows)}行)"
-                )
-                delete_rows_action.triggered.connect(
-                    lambda: self._delete_selected_rows(selected_rows, operate_data)
-                )
-        else:
-            batch_clear_action = menu.addAction("清空所选单元格")
-            batch_clear_action.triggered.connect(self._batch_clear_cells)
-            delete_action = menu.addAction("删除此行")
-            delete_action.triggered.connect(lambda: self.delete_row(row, operate_data))
+        self._ctx_menu.exec(self.view.data_table.viewport().mapToGlobal(pos))
 
+    def _build_context_menu(self) -> None:
+        """创建右键菜单，只在首次右键时创建一次，之后复用"""
+        menu = QMenu(self.view)
+        self._ctx_batch_edit = menu.addAction("批量修改所选单元格")
+        self._ctx_batch_edit.triggered.connect(self._batch_edit_cells)
+        batch_clear_action = menu.addAction("清空所选单元格")
+        batch_clear_action.triggered.connect(self._batch_clear_cells)
+        self._ctx_separator = menu.addSeparator()
+        self._ctx_delete_rows = menu.addAction("删除所选单元格对应的行")
+        self._ctx_delete_rows.triggered.connect(self._on_ctx_delete_rows)
+        self._ctx_delete = menu.addAction("删除此行")
+        self._ctx_delete.triggered.connect(self._on_ctx_delete_row)
         add_action = menu.addAction("在下方增加一行")
-        add_action.triggered.connect(lambda: self.add_row(row))
+        add_action.triggered.connect(self._on_ctx_add_row)
+        self._ctx_menu = menu
+
+    def _on_ctx_delete_rows(self) -> None:
+        """右键菜单：删除所选单元格对应的行"""
+        self._delete_selected_rows(self._ctx_selected_rows, self._ctx_operate_data)
 
-        menu.exec(self.view.data_table.mapToGlobal(pos))
+    def _on_ctx_delete_row(self) -> None:
+        """右键菜单：删除此行"""
+        self.delete_row(self._ctx_row, self._ctx_operate_data)
+
+    def _on_ctx_add_row(self) -> None:
+        """右键菜单：在下方增加一行"""
+        self.add_row(self._ctx_row)
 
     def _get_selected_rows(self, selected_items) -> List:
         row_values = []
-        for item in selected_items:
-            row = item.row()
-            table_widget = selected_items[0].tableWidget()  # 获取表格控件
-            column_count = table_widget.columnCount()  # 获取列数
-            # 遍历该行的所有列，获取每个单元格的值
-            for col in range(column_count):
-                item = table_widget.item(row, col)
-                if item is not None:
-                    row_values.append(item.text())
-                else:
-                    row_values.append("")  # 如果单元格为空，添加空字符串
+        model = self.view.table_model
+        # 同一行选中多个单元格时只读取一次该行的所有值
+        for row in dict.fromkeys(index.row() for index in selected_items):
+            row_values.extend(model.row_values(row))
         return row_values
 
     def _delete_selected_rows(self, selected_rows: set, data: List) -> None:
@@ -394,14 +497,14 @@ class EditController(QObject):
             # 将行号转换为列表并按降序排列，这样从后往前删除不会影响前面的行号
             rows_to_delete = sorted(list(selected_rows), reverse=True)
             # 从后往前删除行，避免行号变化的问题
-            self.edit_tracking_enabled = False
-            for row in rows_to_delete:
-                if 0 <= row < self.view.data_table.rowCount():
-                    self.view.data_table.removeRow(row)
-            self.edit_tracking_enabled = True
-
-            # 更新数据
-            self._collect_current_data()
+            model = self.view.table_model
+            with self._bulk_update():
+                row_count = model.rowCount()
+                remove_row = model.removeRow
+                for row in rows_to_delete:
+                    if 0 <= row < row_count:
+                        remove_row(row)
+
             edit_logger.info(f"删除多行的数据，共{len(rows_to_delete)}行: {data}")
             # 显示删除成功消息
             QMessageBox.information(
@@ -414,28 +517,23 @@ class EditController(QObject):
     def _batch_edit_cells(self) -> None:
         """批量编辑选中的单元格"""
         try:
-            selected_items = self.view.data_table.selectedItems()
+            selected_items = self.view.data_table.selectionModel().selectedIndexes()
             if not selected_items:
                 QMessageBox.warning(self.view, "警告", "请先选择要编辑的单元格")
                 return
 
             # 记录修改前的数据
+            model = self.view.table_model
             edit_info = []
-            for item in selected_items:
-                row = item.row()
-                col = item.column()
-                header_item = self.view.data_table.horizontalHeaderItem(col)
-                field_name = header_item.text() if header_item else f"列{col}"
-                original_value = item.text()
+            for index in selected_items:
+                row = index.row()
+                col = index.column()
+                field_name = model.field_name(col)
+                original_value = model.value(row, col)
 
                 # 获取该行的外销合同号（第0列）
-                contract_item = self.view.data_table.item(row, 0)
-                contract_value = contract_item.text() if contract_item else ""
-
-                col_count = self.view.data_table.columnCount()
-                last_col_index = col_count - 1
-                original_file_item = self.view.data_table.item(row, last_col_index)
-                original_file_value = original_file_item.text() if original_file_item else ""
+                contract_value = model.value(row, 0)
+                original_file_value = model.value(row, self._source_col)
 
                 edit_info.append(
                     {
@@ -446,31 +544,30 @@ class EditController(QObject):
                     }
                 )
 
-            # 弹出输入对话框
-            text, ok = QInputDialog.getText(
-                self.view,
-                "批量修改",
-                f"请输入要设置的值（将应用到{len(selected_items)}个单元格）:",
+            # 弹出输入对话框，可从所选列已有的值中补全
+            columns = {index.column() for index in selected_items}
+            dialog = QInputDialog(self.view)
+            dialog.setWindowTitle("批量修改")
+            dialog.setLabelText(
+                f"请输入要设置的值（将应用到{len(selected_items)}个单元格）:"
             )
+            dialog.setComboBoxEditable(True)
+            dialog.setComboBoxItems([""] + model.distinct_values(columns))
+            ok = dialog.exec() == QInputDialog.Accepted
+            text = dialog.textValue()
 
             if ok and text is not None:
                 try:
-                    # 批量设置值时禁用自动跟踪
-                    self.edit_tracking_enabled = False
-                    for item in selected_items:
-                        if item:
-                            item.setText(text)
-                    self.edit_tracking_enabled = True
-
-                    # 更新数据
-                    self._collect_current_data()
+                    # 批量设置值，不逐个记录为用户编辑
+                    self._set_cells(selected_items, text)
+
                     QMessageBox.information(
                         self.view, "提示", f"已批量修改{len(selected_items)}个单元格"
                     )
 
                     # 记录详细的修改日志
                     for info in edit_info:
-                        info["新值"] = text
+                        info["新值"] = text.strip()
                     edit_logger.info(f"批量修改了{len(edit_info)}个单元格: {edit_info}")
 
                 except Exception as e:
@@ -480,26 +577,22 @@ class EditController(QObject):
 
     def _batch_clear_cells(self) -> None:
         """批量清空选中的单元格"""
-        selected_items = self.view.data_table.selectedItems()
+        selected_items = self.view.data_table.selectionModel().selectedIndexes()
         if not selected_items:
             return
 
         # 记录清空前的数据
+        model = self.view.table_model
         clear_info = []
-        for item in selected_items:
-            row = item.row()
-            col = item.column()
-            header_item = self.view.data_table.horizontalHeaderItem(col)
-            field_name = header_item.text() if header_item else f"列{col}"
-            original_value = item.text()
+        for index in selected_items:
+            row = index.row()
+            col = index.column()
+            field_name = model.field_name(col)
+            original_value = model.value(row, col)
             if original_value:  # 只记录非空的单元格
                 # 获取该行的外销合同号（第0列）
-                contract_item = self.view.data_table.item(row, 0)
-                contract_value = contract_item.text() if contract_item else ""
-                col_count = self.view.data_table.columnCount()
-                last_col_index = col_count - 1
-                original_file_item = self.view.data_table.item(row, last_col_index)
-                original_file_value = original_file_item.text() if original_file_item else ""
+                contract_value = model.value(row, 0)
+                original_file_value = model.value(row, self._source_col)
                 clear_info.append(
                     {
                         "外销合同号": contract_value,
@@ -519,14 +612,9 @@ class EditController(QObject):
         )
 
         if reply == QMessageBox.Yes:
-            # 批量清空时禁用自动跟踪
-            self.edit_tracking_enabled = False
-            for item in selected_items:
-                item.setText("")
-            self.edit_tracking_enabled = True
-
-            # 更新数据
-            self._collect_current_data()
+            # 批量清空，不逐个记录为用户编辑
+            self._set_cells(selected_items, "")
+
             QMessageBox.information(
                 self.view, "提示", f"已清空{len(selected_items)}个单元格"
             )
@@ -544,33 +632,19 @@ class EditController(QObject):
             row: 要删除的行号
             data: 删除的数据列表
         """
-        self.edit_tracking_enabled = False
-        self.view.data_table.removeRow(row)
-        self.edit_tracking_enabled = True
-        self._collect_current_data()
+        self.view.table_model.removeRow(row)
         edit_logger.info(f"删除单行的数据 {data}")
 
-    def add_row(self, row: int) -> None:
-        """在指定行下方增加一行
+    def add_row(self, row: int, count: int = 1) -> None:
+        """在指定行下方增加若干行
 
         Args:
             row: 基准行号
+            count: 增加的行数
         """
-        new_row = row + 1
-        self.view.data_table.insertRow(new_row)
-        col_count = self.view.data_table.columnCount()
-        custom_color = QColor("#FFF9C4")
-
-        # 新增行时禁用自动跟踪
-        self.edit_tracking_enabled = False
-        for col in range(col_count):
-            item = QTableWidgetItem("")
-            item.setFlags(item.flags() | Qt.ItemIsEditable)
-            item.setBackground(custom_color)
-            self.view.data_table.setItem(new_row, col, item)
-        self.edit_tracking_enabled = True
-
-        self._collect_current_data()
+        # 一次性插入所有新行，新增行使用高亮背景色，且不记录为用户编辑
+        with self._bulk_update():
+            self.view.table_model.insertRows(row + 1, count)
 
     def set_data(self) -> None:
         """设置要编辑的数据"""
@@ -588,21 +662,18 @@ class EditController(QObject):
         """处理临时保存按钮点击事件"""
         # 收集当前界面的数据
         self._collect_current_data()
-
-        if not self._save_temp_data():
-            return
-
-        QMessageBox.information(self.view, "提示", "数据已保存")
-        # 发出数据保存完成信号
-        self.data_saved.emit()
+        self._save_temp_data()
 
     def _save_temp_data(self) -> bool:
-        """保存临时数据到文件
+        """在后台线程中保存临时数据到文件
 
         Returns:
-            保存是否成功
+            保存任务是否已启动
         """
         try:
+            if self._save_worker is not None:
+                return False
+
             if not self.data:
                 QMessageBox.warning(self.view, "警告", "没有数据需要保存")
                 return False
@@ -619,102 +690,70 @@ class EditController(QObject):
 
             temp_path = os.path.join(temp_dir, "temp_data.json")
 
-            # 检查磁盘空间
-            try:
-                import shutil
-
-                free_space = shutil.disk_usage(temp_dir).free
-                if free_space < 1024 * 1024:  # 小于1MB
-                    QMessageBox.warning(self.view, "警告", "磁盘空间不足，无法保存数据")
-                    return False
-            except Exception:
-                pass  # 如果检查失败，继续尝试保存
-
-            with open(temp_path, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
-
-            # 验证文件是否正确保存
-            if not os.path.exists(temp_path) or os.path.getsize(temp_path) == 0:
-                QMessageBox.critical(
-                    self.view, "错误", "数据保存失败，文件为空或未创建"
-                )
-                return False
-
+            # 复制一份行数据交给工作线程，避免写入过程中表格被继续编辑
+            snapshot = [dict(data_row) for data_row in self.data]
+            self._save_worker = TempSaveWorker(
+                snapshot, temp_path, self._last_saved_hash
+            )
+            self._save_worker.save_finished.connect(self._on_temp_save_finished)
+            self.view.temp_save_button.setEnabled(False)
+            self._save_worker.start()
             return True
         except Exception as e:
             QMessageBox.critical(self.view, "错误", f"保存数据失败: {str(e)}")
             return False
 
-    def _collect_current_data(self) -> None:
-        """收集当前界面的数据"""
-        try:
-            if not hasattr(self.view, "data_table") or not self.view.data_table:
-                QMessageBox.warning(self.view, "错误", "数据表格未初始化")
-                return
-
-            data_list = []
-            row_count = self.view.data_table.rowCount()
-            col_count = self.view.data_table.columnCount()
-
-            if row_count == 0:
-                self.data = []
-                return
-
-            for row in range(row_count):
-                row_data = {}
-                try:
-                    for col in range(col_count):
-                        # 获取表头标题作为字段名称
-                        header_item = self.view.data_table.horizontalHeaderItem(col)
-                        if not header_item:
-                            continue
+    def _on_temp_save_finished(self, success: bool, error_msg: str) -> None:
+        """处理临时数据保存完成事件
 
-                        field_name = header_item.text()
+        Args:
+            success: 是否保存成功
+            error_msg: 错误信息
+        """
+        worker = self._save_worker
+        self._save_worker = None
+        if worker is not None:
+            worker.wait()
+            worker.deleteLater()
+        self.view.temp_save_button.setEnabled(True)
+
+        if not success:
+            QMessageBox.critical(self.view, "错误", error_msg)
+            return
 
-                        # 获取字段值
-                        value_item = self.view.data_table.item(row, col)
-                        field_value = value_item.text().strip() if value_item else ""
+        if worker is not None and not worker.written:
+            QMessageBox.information(self.view, "提示", "数据未修改，无需重复保存")
+            # 跳过的只是重复写盘，保存流程仍然完成
+            self.data_saved.emit()
+            return
 
-                        # 更新数据
-                        row_data[field_name] = field_value
+        if worker is not None:
+            self._last_saved_hash = worker.payload_hash
+        QMessageBox.information(self.view, "提示", "数据已保存")
+        # 发出数据保存完成信号
+        self.data_saved.emit()
 
-                    if row_data:  # 只添加非空行
-                        data_list.append(row_data)
+    def _collect_current_data(self) -> None:
+        """将表格模型中的数据同步到 self.data 和数据管理器
 
-                except Exception as e:
-                    print(f"收集第{row}行数据时出错: {str(e)}")
-                    continue
+        交出的是行数据的副本，外部代码修改它不会绕过模型的变更通知；
+        只在保存、提交前调用，展示数据时不会改动数据管理器中的数据。
+        """
+        try:
+            # 表格模型中的行数据已按 EXTRA_FIELD 字段名组织，
+            # 无需再逐列读取表头和单元格重新收集
+            model = getattr(self.view, "table_model", None)
+            if model is None:
+                QMessageBox.warning(self.view, "错误", "数据表格未初始化")
+                return
 
+            data_list = model.rows()
             self.data = data_list
             self.data_manager.set_current_data(data_list)
+            # 交出的数据与表格一致，再次展示时无需重新填充
+            self._rendered_rows = data_list
+            self._dirty = False
 
         except Exception as e:
             QMessageBox.critical(self.view, "错误", f"收集数据时发生错误: {str(e)}")
             self.data = []
-
-    # 可选的编辑模式切换方法（如果需要的话）
-    def _on_edit_clicked(self) -> None:
-        """处理编辑按钮点击事件"""
-        # 使表格可编辑
-        self.view.data_table.setEditTriggers(
-            QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed
-        )
-        # 显示保存按钮
-        self.view.temp_save_button.setVisible(True)
-        # 更改编辑按钮文本
-        self.view.edit_button.setText("结束编辑")
-        # 重新连接信号以切换模式
-        self.view.edit_button.clicked.disconnect()
-        self.view.edit_button.clicked.connect(self._on_end_edit_clicked)
-
-    def _on_end_edit_clicked(self) -> None:
-        """处理结束编辑按钮点击事件"""
-        # 使表格不可编辑
-        self.view.data_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        # 隐藏保存按钮
-        self.view.temp_save_button.setVisible(False)
-        # 恢复编辑按钮文本
-        self.view.edit_button.setText("编辑数据")
-        # 重新连接信号
-        self.view.edit_button.clicked.disconnect()
-        self.view.edit_button.clicked.connect(self._on_edit_clicked)
@@ -1,8 +1,11 @@
 import os
-import json
+import logging
+import time
 import uuid
-import xlwings as xw
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from typing import List, Tuple, Dict, Any
+
 from PySide6.QtCore import SignalInstance
 
 from utils.process_excel.excel_process import (
@@ -10,13 +13,22 @@ from utils.process_excel.excel_process import (
     split_excel_sheets,
     convert_excel_to_images,
     auto_adjust_excel_column_width,
+    new_excel_app,
+)
+from config.config import (
+    LAYOUT_IDENTIFY_PROMPT,
+    EXCEL_TABLE_EXTRACTION_PROMPT,
+    EXCEL_TABLE_JSON_EXTRACTION_PROMPT,
+    EXCEL_EXTRACTION_MODE,
 )
-from utils.process_excel.excel_llm import detect_excel_layout, determine_header_index, extract_excel_data_to_markdown, \
-    correct_excel_table
+from utils.process_excel.excel_llm import detect_excel_layout, determine_header_index, \
+    extract_excel_data_to_markdown_batch, extract_excel_data_to_json, correct_excel_table, \
+    VL_MODEL
 from utils.process_excel.process_flat_layout import (
     read_excel_first_20_rows,
     split_excel_by_rows_with_header,
     format_excel_files_in_directory,
+    crop_sheet_image_by_rows,
 )
 from utils.process_excel.process_excel_blocks import (
     format_excel_and_convert_to_image,
@@ -26,12 +38,121 @@ from utils.process_excel.process_master_detail_layout import (
     split_excel_by_rows,
 )
 from utils.model_md_to_json import extract_info_from_md
+from utils import llm_cache
 from utils.logger import get_file_conversion_logger, get_error_logger
 
 # 使用统一的日志系统
 logger = get_file_conversion_logger()
 error_logger = get_error_logger()
 
+# 同时进行的多模态模型请求数，请求以等待网络为主
+_MODEL_WORKERS = 8
+
+
+def _prepare_one_excel(
+        file_path: str, base_name: str, safe_base_name: str, output_dir: str
+) -> List[Dict[str, Any]]:
+    """
+    准备单个Excel文件：转换xls、拆分sheet、剔除空sheet并生成图片
+
+    该函数在子进程中执行，因此只能使用可序列化的参数，不能访问Qt信号
+
+    参数：
+        file_path: Excel文件路径
+        base_name: 原始基础名称
+        safe_base_name: 仅包含ASCII字符的安全名称
+        output_dir: 输出目录
+
+    返回：
+        该文件中所有有效sheet的信息列表
+    """
+    # 创建工作目录
+    excel_work_dir = os.path.join(output_dir, f"excel_work_{safe_base_name}")
+    os.makedirs(excel_work_dir, exist_ok=True)
+
+    split_dir = os.path.join(excel_work_dir, "split_sheets")
+    os.makedirs(split_dir, exist_ok=True)
+
+    # 转换和拆分共用同一个Excel实例
+    app = new_excel_app()
+    try:
+        # 转换xls为xlsx
+        xlsx_file = file_path
+        if file_path.lower().endswith(".xls"):
+            xlsx_file = os.path.join(excel_work_dir, f"{safe_base_name}.xlsx")
+            convert_xls_to_xlsx(file_path, xlsx_file, app=app)
+            logger.debug("已转换 .xls 为 .xlsx: %s", xlsx_file)
+
+        # 拆分sheet，拆分时已统计每个sheet有数据的行数
+        split_info = split_excel_sheets(xlsx_file, split_dir, app=app)
+    finally:
+        app.quit()
+
+    split_sheets = []  # [(文件路径, sheet名称), ...]
+    for file, data_rows in split_info.values():
+        if data_rows > 0:
+            # 拆分后的文件名即为 "<sheet名称>.xlsx"
+            split_sheets.append((file, os.path.basename(file)[:-len(".xlsx")]))
+        else:
+            logger.debug("跳过空的 Excel 文件: %s", os.path.basename(file))
+            try:
+                os.remove(file)
+            except OSError:
+                pass
+
+    logger.debug("'%s' 拆分后有效文件数量: %d", base_name, len(split_sheets))
+
+    if not split_sheets:
+        logger.debug("警告: Excel 文件 '%s' 的所有工作表都为空，跳过处理", base_name)
+        return []
+
+    # 转换为图片
+    image_dir = os.path.join(excel_work_dir, "images")
+    os.makedirs(image_dir, exist_ok=True)
+    convert_excel_to_images([path for path, _ in split_sheets], image_dir)
+
+    # 收集sheet信息
+    sheets_info = []
+    for split_file, sheet_name in split_sheets:
+        image_file = os.path.join(image_dir, f"{sheet_name}.png")
+
+        if os.path.exists(image_file):
+            sheets_info.append(
+                {
+                    "sheet_path": split_file,
+                    "sheet_name": sheet_name,
+                    "image_path": image_file,
+                    "original_file": file_path,
+                    "safe_name": safe_base_name,
+                    "work_dir": excel_work_dir,
+                    "base_name": base_name,
+                }
+            )
+        else:
+            logger.debug("图片文件不存在，跳过: %s", image_file)
+    return sheets_info
+
+
+def _collect_images(excel_files: List[str], image_dir: str) -> List[str]:
+    """
+    按Excel文件顺序收集转换生成的同名图片
+
+    参数：
+        excel_files: 已转换的Excel文件路径列表
+        image_dir: 图片输出目录
+
+    返回：
+        实际生成的图片文件路径列表
+    """
+    image_files = []
+    for excel_file in excel_files:
+        stem = os.path.splitext(os.path.basename(excel_file))[0]
+        image_file = os.path.join(image_dir, f"{stem}.png")
+        if os.path.exists(image_file):
+            image_files.append(image_file)
+    return image_files
+
+
 class ExcelProcessHandler:
     """Excel文件处理器"""
 
@@ -48,6 +169,23 @@ class ExcelProcessHandler:
         self.output_dir = output_dir
         self.status_signal = status_signal
         self.original_file_mapping = original_file_mapping or {}
+        # 批量处理期间共享的Excel实例，首次使用时启动
+        self._xw_app = None
+
+    def _get_xw_app(self):
+        """返回共享的Excel实例，不存在时启动一个"""
+        if self._xw_app is None:
+            self._xw_app = new_excel_app()
+        return self._xw_app
+
+    def close(self) -> None:
+        """退出共享的Excel实例"""
+        if self._xw_app is not None:
+            try:
+                self._xw_app.quit()
+            except Exception as e:
+                logger.debug("退出Excel实例时出错: %s", e)
+            self._xw_app = None
 
     def _emit_status(self, message: str):
         """发送状态更新信号"""
@@ -64,6 +202,13 @@ class ExcelProcessHandler:
         返回：
             包含所有处理结果的字典
         """
+        try:
+            return self._process_excel_files_batch(excel_files)
+        finally:
+            self.close()
+
+    def _process_excel_files_batch(self, excel_files: List[Tuple[str, str]]) -> dict:
+        """批量处理多个Excel文件，参数和返回值同 process_excel_files_batch"""
         result = {
             "files": [],
             "excel_data": [],
@@ -76,238 +221,351 @@ class ExcelProcessHandler:
         )  # [(sheet_path, sheet_name, image_path, original_file, safe_name), ...]
 
         self._emit_status(f"正在准备 {len(excel_files)} 个Excel文件...")
+        llm_cache.prune()
 
-        for file_path, base_name in excel_files:
-            # 处理中文文件名
-            safe_base_name = self._generate_safe_filename(base_name)
-
-            # 创建工作目录
-            excel_work_dir = os.path.join(
-                self.output_dir, f"excel_work_{safe_base_name}"
-            )
-            os.makedirs(excel_work_dir, exist_ok=True)
-
-            # 转换xls为xlsx
-            xlsx_file = file_path
-            if file_path.lower().endswith(".xls"):
-                self._emit_status(f"正在转换 .xls 为 .xlsx: {base_name}")
-                xlsx_file = os.path.join(excel_work_dir, f"{safe_base_name}.xlsx")
-                convert_xls_to_xlsx(file_path, xlsx_file)
-                print(f"已转换 .xls 为 .xlsx: {xlsx_file}")
-
-            # 拆分sheet
-            self._emit_status(f"正在拆分工作表: {base_name}")
-            split_dir = os.path.join(excel_work_dir, "split_sheets")
-            os.makedirs(split_dir, exist_ok=True)
-            split_excel_sheets(xlsx_file, split_dir)
-
-            # 获取有效的sheet文件
-            all_split_files = [
-                os.path.join(split_dir, f)
-                for f in os.listdir(split_dir)
-                if f.endswith(".xlsx")
-            ]
-
-            split_files = []
-            for file in all_split_files:
-                if not self._is_excel_empty(file):
-                    split_files.append(file)
-                else:
-                    print(f"跳过空的 Excel 文件: {os.path.basename(file)}")
-                    try:
-                        os.remove(file)
-                    except:
-                        pass
-
-            print(f"'{base_name}' 拆分后有效文件数量: {len(split_files)}")
-
-            if not split_files:
-                print(f"警告: Excel 文件 '{base_name}' 的所有工作表都为空，跳过处理")
-                continue
-
-            # 转换为图片
-            self._emit_status(f"正在转换为图片: {base_name}")
-            image_dir = os.path.join(excel_work_dir, "images")
-            os.makedirs(image_dir, exist_ok=True)
-            convert_excel_to_images(split_files, image_dir)
-
-            # 收集sheet信息
-            for split_file in split_files:
-                sheet_name = os.path.splitext(os.path.basename(split_file))[0]
-                image_file = os.path.join(image_dir, f"{sheet_name}.png")
-
-                if os.path.exists(image_file):
-                    all_sheets_info.append(
-                        {
-                            "sheet_path": split_file,
-                            "sheet_name": sheet_name,
-                            "image_path": image_file,
-                            "original_file": file_path,
-                            "safe_name": safe_base_name,
-                            "work_dir": excel_work_dir,
-                            "base_name": base_name,
-                        }
+        # 各文件的准备工作互不依赖，在多个进程中并行执行；结果按输入顺序合并
+        tasks = [
+            (file_path, base_name, self._generate_safe_filename(base_name))
+            for file_path, base_name in excel_files
+        ]
+        prepared: List[List[Dict[str, Any]]] = [[] for _ in tasks]
+        if len(tasks) == 1:
+            prepared[0] = _prepare_one_excel(*tasks[0], self.output_dir)
+        elif tasks:
+            max_workers = min(len(tasks), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(_prepare_one_excel, *task, self.output_dir): idx
+                    for idx, task in enumerate(tasks)
+                }
+                for done_count, future in enumerate(as_completed(futures), 1):
+                    idx = futures[future]
+                    prepared[idx] = future.result()
+                    self._emit_status(
+                        f"已完成准备 ({done_count}/{len(tasks)}): {tasks[idx][1]}"
                     )
-                else:
-                    print(f"图片文件不存在，跳过: {image_file}")
+        for sheets in prepared:
+            all_sheets_info.extend(sheets)
 
         if not all_sheets_info:
-            print("没有找到可用的sheet进行处理")
+            logger.debug("没有找到可用的sheet进行处理")
             return result
 
         # 第二阶段：批量布局检测（一次性检测所有图片）
-        print(f"\n{'=' * 60}")
-        print(f"收集到 {len(all_sheets_info)} 个sheet，开始批量布局检测...")
-        print(f"{all_sheets_info}")
-        print(f"{'=' * 60}\n")
+        logger.debug("收集到 %d 个sheet，开始批量布局检测", len(all_sheets_info))
 
         self._emit_status(f"正在批量检测布局类型（共{len(all_sheets_info)}个工作表）...")
 
         all_image_paths = [info["image_path"] for info in all_sheets_info]
-        print(f"批量检测图片: {all_image_paths}")
-        layout_results = detect_excel_layout(all_image_paths)
-        print(f"批量布局检测结果: {layout_results}")
+        logger.debug("批量检测图片数量: %d", len(all_image_paths))
+        layouts = self._detect_layouts(all_image_paths)
 
-        # 解析布局结果
-        try:
-            if isinstance(layout_results, str):
-                layout_dict = json.loads(layout_results)
-            else:
-                layout_dict = layout_results
-        except Exception as e:
-            print(f"解析布局检测结果失败: {e}, 使用默认布局")
-            layout_dict = {}
-
-        # 为每个sheet添加布局类型
-        for idx, sheet_info in enumerate(all_sheets_info):
-            layout_key = f"index_{idx + 1}"
-            layout_num = layout_dict.get(layout_key, 0)
-            try:
-                layout_num = int(layout_num)
-            except:
-                print(f"无法解析布局类型 {layout_key}: {layout_num}，默认为类型0")
-                layout_num = 0
-            sheet_info["layout_type"] = layout_num
-
-        # 第三阶段：按布局类型分组
-        layout_groups = {}
-        for sheet_info in all_sheets_info:
-            layout_type = sheet_info["layout_type"]
-            if layout_type not in layout_groups:
-                layout_groups[layout_type] = []
+        # 第三阶段：为每个sheet添加布局类型并按布局类型分组
+        layout_groups = defaultdict(list)
+        for sheet_info, layout_type in zip(all_sheets_info, layouts):
+            sheet_info["layout_type"] = layout_type
             layout_groups[layout_type].append(sheet_info)
 
-        print(f"\n布局分组结果:")
-        for layout_type, sheets in sorted(layout_groups.items()):
-            print(f"  布局{layout_type}: {len(sheets)}个sheet")
+        if logger.isEnabledFor(logging.DEBUG):
+            for layout_type, sheets in sorted(layout_groups.items()):
+                logger.debug("布局%s: %d个sheet", layout_type, len(sheets))
 
         # 第四阶段：按布局类型队列处理
-        print(f"\n{'=' * 60}")
-        print(f"开始按布局类型队列处理...")
-        print(f"{'=' * 60}\n")
+        logger.debug("开始按布局类型队列处理")
 
         # 处理顺序：1(扁平式) -> 3(分块式) -> 2(主表+子表) -> 0(其他)
         process_order = [1, 3, 2, 0]
 
-        for layout_type in process_order:
-            if layout_type not in layout_groups:
-                continue
+        use_markdown = EXCEL_EXTRACTION_MODE == "markdown"
+        # 渲染依赖共享的Excel实例，只在当前线程中依次执行；大模型调用以等待网络为主，
+        # 提交到线程池后立即渲染下一个sheet，使渲染与模型调用重叠。
+        # 扁平式布局的提取共用 output 目录，同一时间只能执行一个
+        jobs = []  # [(sheet_info, image_files, 数据提取任务), ...]，按处理顺序合并
+        markdown_sheets = []  # markdown 模式下待合并请求的 [(sheet_info, image_files), ...]
+        with ThreadPoolExecutor(max_workers=1) as flat_pool, \
+                ThreadPoolExecutor(max_workers=_MODEL_WORKERS) as model_pool:
+            for layout_type in process_order:
+                if layout_type not in layout_groups:
+                    continue
+
+                sheets = layout_groups[layout_type]
+                logger.debug("处理布局类型 %s (%d 个sheet)", layout_type, len(sheets))
+
+                for idx, sheet_info in enumerate(sheets):
+                    logger.debug(
+                        "[%d/%d] %s - %s", idx + 1, len(sheets),
+                        sheet_info["base_name"], sheet_info["sheet_name"],
+                    )
 
-            sheets = layout_groups[layout_type]
-            print(f"\n>>> 处理布局类型 {layout_type} ({len(sheets)} 个sheet)")
+                    if layout_type == 1:
+                        self._emit_status(f"处理扁平式布局: {sheet_info['sheet_name']}")
+                        image_files = self._process_flat_layout(
+                            sheet_info["sheet_path"], sheet_info["sheet_name"],
+                            sheet_info["work_dir"],
+                        )
+                        pool, extract = flat_pool, self._extract_flat_sheet_data
+                    else:
+                        image_files = self._render_sheet_images(sheet_info, layout_type)
+                        if use_markdown:
+                            # markdown 模式把多个sheet合并到尽量少的请求中，渲染全部完成后统一提交
+                            if image_files:
+                                markdown_sheets.append((sheet_info, image_files))
+                            continue
+                        pool, extract = model_pool, self._extract_json_sheet_data
+
+                    future = pool.submit(extract, sheet_info, image_files) if image_files else None
+                    jobs.append((sheet_info, image_files, future))
+
+            markdown_future = None
+            if markdown_sheets:
+                self._emit_status(f"正在批量提取数据（共{len(markdown_sheets)}个工作表）...")
+                markdown_future = model_pool.submit(
+                    self._extract_markdown_sheets_data, markdown_sheets
+                )
 
-            for idx, sheet_info in enumerate(sheets):
-                print(
-                    f"  [{idx + 1}/{len(sheets)}] {sheet_info['base_name']} - {sheet_info['sheet_name']}"
+            for sheet_info, image_files, future in jobs:
+                sheet_data = future.result() if future is not None else []
+                self._merge_sheet_result(
+                    result, {"files": image_files, "data": sheet_data}, sheet_info
                 )
+            if markdown_future is not None:
+                for (sheet_info, image_files), sheet_data in zip(
+                        markdown_sheets, markdown_future.result()
+                ):
+                    self._merge_sheet_result(
+                        result, {"files": image_files, "data": sheet_data}, sheet_info
+                    )
 
-                # 处理单个sheet
-                sheet_result = self._process_single_sheet(sheet_info, layout_type)
+        logger.debug(
+            "处理完成，共 %d 张图片、%d 条记录", len(result["files"]), len(result["excel_data"])
+        )
+        return result
 
-                if sheet_result:
-                    result["files"].extend(sheet_result.get("files", []))
-                    result["excel_data"].extend(sheet_result.get("data", []))
+    def _detect_layouts(self, image_paths: List[str]) -> List[int]:
+        """
+        批量检测布局类型，已缓存结果的图片不再调用大模型，内容相同的图片只检测一次
 
-                    # 更新文件映射
-                    for file in sheet_result.get("files", []):
-                        file_name = os.path.splitext(os.path.basename(file))[0]
-                        result["file_mapping"][file_name] = sheet_info["original_file"]
+        参数：
+            image_paths: 图片路径列表
 
-        print("处理完成", result)
-        return result
+        返回：
+            与输入顺序一致的布局类型列表，无法识别时为0
+        """
+        # 每张图片只读取一次，同一份内容既用于计算缓存键，也直接发送给大模型
+        image_data = []
+        for path in image_paths:
+            with open(path, "rb") as f:
+                image_data.append(f.read())
+        keys = [
+            llm_cache.make_key(
+                (llm_cache.data_digest(data), VL_MODEL, LAYOUT_IDENTIFY_PROMPT)
+            )
+            for data in image_data
+        ]
+        # 相同模板的sheet内容相同，每个缓存键只读取一次
+        cached = {key: llm_cache.load("layout", key) for key in dict.fromkeys(keys)}
+        layouts = [cached[key] for key in keys]
+        missing = [idx for idx, layout_num in enumerate(layouts) if layout_num is None]
+        logger.debug("布局检测缓存命中 %d/%d", len(keys) - len(missing), len(keys))
+
+        if missing:
+            # 按内容去重，缓存键 -> 首次出现的图片位置
+            unique = {}
+            for idx in missing:
+                unique.setdefault(keys[idx], idx)
+            logger.debug("待检测图片 %d 张，去重后 %d 张", len(missing), len(unique))
+
+            layout_dict = detect_excel_layout([image_data[idx] for idx in unique.values()])
+            logger.debug("批量布局检测结果: %s", layout_dict)
+
+            # 将本次检测的序号映射回缓存键
+            key_layouts = {}
+            for pos, key in enumerate(unique):
+                layout_key = f"index_{pos + 1}"
+                layout_num = layout_dict.get(layout_key, 0)
+                try:
+                    layout_num = int(layout_num)
+                except (TypeError, ValueError):
+                    logger.debug("无法解析布局类型 %s: %s，默认为类型0", layout_key, layout_num)
+                    layout_num = 0
+                else:
+                    if layout_key in layout_dict:
+                        llm_cache.save("layout", key, layout_num)
+                key_layouts[key] = layout_num
+
+            # 内容相同的图片共用同一检测结果
+            for idx in missing:
+                layouts[idx] = key_layouts[keys[idx]]
+
+        return layouts
+
+    def _extract_json_batch(self, sheet_images: List[List[str]]) -> List[dict]:
+        """
+        由多模态模型直接提取各sheet的结构化数据，已缓存结果的sheet不再调用大模型
 
-    def _process_single_sheet(self, sheet_info: dict, layout_type: int) -> dict:
+        参数：
+            sheet_images: 每个sheet按顺序排列的图片路径列表
+
+        返回：
+            与输入顺序一致的提取结果列表
+        """
+        keys = [
+            llm_cache.make_key(
+                (*map(llm_cache.file_digest, images), VL_MODEL, EXCEL_TABLE_JSON_EXTRACTION_PROMPT)
+            )
+            for images in sheet_images
+        ]
+        json_list = [llm_cache.load("json", key) for key in keys]
+        missing = [idx for idx, parsed in enumerate(json_list) if parsed is None]
+        logger.debug("数据提取缓存命中 %d/%d", len(keys) - len(missing), len(keys))
+
+        for idx in missing:
+            try:
+                parsed = extract_excel_data_to_json(sheet_images[idx])
+            except Exception as e:
+                error_msg = f"提取表格数据失败: {str(e)}"
+                error_logger.error(error_msg)
+                parsed = {}
+            json_list[idx] = parsed
+            if parsed:
+                llm_cache.save("json", keys[idx], parsed)
+
+        return json_list
+
+    def _extract_markdown_batch(self, sheet_images: List[List[str]]) -> List[str]:
+        """
+        批量提取各sheet的markdown内容，已缓存结果的sheet不再调用大模型
+
+        参数：
+            sheet_images: 每个sheet按顺序排列的图片路径列表
+
+        返回：
+            与输入顺序一致的markdown内容列表
         """
-        处理单个sheet
+        keys = [
+            llm_cache.make_key(
+                (*map(llm_cache.file_digest, images), VL_MODEL, EXCEL_TABLE_EXTRACTION_PROMPT)
+            )
+            for images in sheet_images
+        ]
+        markdown_list = [llm_cache.load("markdown", key) for key in keys]
+        missing = [idx for idx, markdown in enumerate(markdown_list) if markdown is None]
+        logger.debug("数据提取缓存命中 %d/%d", len(keys) - len(missing), len(keys))
+
+        if missing:
+            fresh_list = extract_excel_data_to_markdown_batch(
+                [sheet_images[idx] for idx in missing]
+            )
+            for idx, markdown in zip(missing, fresh_list):
+                markdown_list[idx] = markdown
+                if markdown:
+                    llm_cache.save("markdown", keys[idx], markdown)
+
+        return markdown_list
+
+    @staticmethod
+    def _merge_sheet_result(result: dict, sheet_result: dict, sheet_info: dict) -> None:
+        """
+        将单个sheet的处理结果合并到批量结果中
 
         参数：
+            result: 批量处理结果
+            sheet_result: 单个sheet的处理结果
             sheet_info: sheet信息字典
-            layout_type: 布局类型
+        """
+        if not sheet_result:
+            return
+        result["files"].extend(sheet_result.get("files", []))
+        result["excel_data"].extend(sheet_result.get("data", []))
+
+        # 更新文件映射
+        for file in sheet_result.get("files", []):
+            file_name = os.path.splitext(os.path.basename(file))[0]
+            result["file_mapping"][file_name] = sheet_info["original_file"]
+
+    def _extract_flat_sheet_data(
+            self, sheet_info: dict, image_files: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        提取单个扁平式布局sheet的数据，在提取线程中执行
+
+        参数：
+            sheet_info: sheet信息字典
+            image_files: 该sheet渲染出的图片路径列表
+
+        返回：
+            提取的数据列表
+        """
+        self._emit_status(f"正在提取扁平式布局数据: {sheet_info['sheet_name']}")
+        # 使用原始文件路径，由提取过程直接写入源文件字段
+        original_file = sheet_info["original_file"]
+        display_file = self.original_file_mapping.get(original_file, original_file)
+        return self._extract_flat_layout_data(image_files, display_file)
+
+    def _extract_json_sheet_data(
+            self, sheet_info: dict, image_files: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        由多模态模型提取单个分块或主表+子表布局sheet的数据，在提取线程中执行
+
+        参数：
+            sheet_info: sheet信息字典
+            image_files: 该sheet按顺序排列的图片路径列表
+
+        返回：
+            提取的数据列表
+        """
+        self._emit_status(f"正在提取数据: {sheet_info['sheet_name']}")
+        extracted = self._extract_json_batch([image_files])[0]
+        return self._extract_block_layout_data(extracted, sheet_info["original_file"])
+
+    def _extract_markdown_sheets_data(
+            self, sheets: List[Tuple[dict, List[str]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        以 markdown 方式合并请求提取多个sheet的数据，在提取线程中执行
+
+        参数：
+            sheets: [(sheet_info, image_files), ...]
 
         返回：
-            处理结果字典
+            与输入顺序一致的各sheet数据列表
+        """
+        markdown_list = self._extract_markdown_batch([image_files for _, image_files in sheets])
+        sheet_data_list = []
+        for (sheet_info, _), markdown in zip(sheets, markdown_list):
+            self._emit_status(f"正在整理提取结果: {sheet_info['sheet_name']}")
+            logger.debug(
+                "提取的 Markdown 内容长度: %d for %s", len(markdown), sheet_info["sheet_name"]
+            )
+            sheet_data_list.append(self._extract_block_layout_data(
+                self._markdown_to_json(markdown), sheet_info["original_file"]
+            ))
+        return sheet_data_list
+
+    def _render_sheet_images(self, sheet_info: dict, layout_type: int) -> List[str]:
         """
-        result = {"files": [], "data": []}
+        为分块布局或主表+子表布局的sheet生成待提取的图片
 
+        参数：
+            sheet_info: sheet信息字典
+            layout_type: 布局类型
+
+        返回：
+            按顺序排列的图片文件路径列表
+        """
         sheet_path = sheet_info["sheet_path"]
         sheet_name = sheet_info["sheet_name"]
         work_dir = sheet_info["work_dir"]
-        original_file = sheet_info["original_file"]
-
-        if layout_type == 1:
-            # 扁平式布局
-            self._emit_status(f"处理扁平式布局: {sheet_name}")
-            image_files = self._process_flat_layout(sheet_path, sheet_name, work_dir)
-            result["files"].extend(image_files)
-
-            if image_files:
-                self._emit_status(f"正在提取扁平式布局数据: {sheet_name}")
-                flat_data = self._extract_flat_layout_data(image_files)
-                # 使用原始文件路径
-                display_file = self.original_file_mapping.get(original_file, original_file)
-                for item in flat_data:
-                    item["源文件"] = display_file
-                result["data"].extend(flat_data)
-
-        elif layout_type == 2:
-            # 主表+子表布局
-            self._emit_status(f"处理主表+子表布局: {sheet_name}")
-            result_data = self._process_master_detail_layout(sheet_path, sheet_name, work_dir)
-
-            if result_data:
-                result["files"].extend(result_data["files"])
-                self._emit_status(f"正在提取主表+子表布局数据: {sheet_name}")
-                master_detail_data = self._extract_block_layout_data(
-                    result_data["markdown"], original_file
-                )
-                result["data"].extend(master_detail_data)
 
-        elif layout_type == 3:
+        if layout_type == 3:
             # 分块布局
             self._emit_status(f"处理分块布局: {sheet_name}")
-            result_data = self._process_block_layout(sheet_path, sheet_name, work_dir)
+            return self._process_block_layout(sheet_path, sheet_name, work_dir)
 
-            if result_data:
-                result["files"].append(result_data["file"])
-                self._emit_status(f"正在提取分块布局数据: {sheet_name}")
-                block_data = self._extract_block_layout_data(
-                    result_data["markdown"], original_file
-                )
-                result["data"].extend(block_data)
-
-        else:
-            self._emit_status(f"处理主表+子表布局: {sheet_name}")
-            result_data = self._process_master_detail_layout(sheet_path, sheet_name, work_dir)
-
-            if result_data:
-                result["files"].extend(result_data["files"])
-                self._emit_status(f"正在提取主表+子表布局数据: {sheet_name}")
-                master_detail_data = self._extract_block_layout_data(
-                    result_data["markdown"], original_file
-                )
-                result["data"].extend(master_detail_data)
-
-        return result
+        # 主表+子表布局，其他布局也按此方式处理
+        self._emit_status(f"处理主表+子表布局: {sheet_name}")
+        return self._process_master_detail_layout(sheet_path, sheet_name, work_dir)
 
     def _process_flat_layout(
             self, excel_file: str, sheet_name: str, work_dir: str
@@ -320,21 +578,55 @@ class ExcelProcessHandler:
         """
         # 读取前20行确定表头
         self._emit_status(f"正在分析表头: {sheet_name}")
-        rows = read_excel_first_20_rows(excel_file)
+        rows = read_excel_first_20_rows(excel_file, app=self._get_xw_app())
         header_index = int(determine_header_index(rows))
-        print(f"表头索引: {header_index} for {sheet_name}")
+        logger.debug("表头索引: %d for %s", header_index, sheet_name)
 
+        # 格式化整张表格并只渲染一次，再按行裁剪为多张带表头的图片
+        self._emit_status(f"正在格式化和转换: {sheet_name}")
+        full_image = os.path.join(work_dir, f"flat_full_{sheet_name}.png")
+        image_output_dir = os.path.join(work_dir, f"flat_images_{sheet_name}")
+        try:
+            format_excel_and_convert_to_image(
+                excel_file, full_image, app=self._get_xw_app()
+            )
+            self._emit_status(f"正在切分图片: {sheet_name}")
+            image_files = crop_sheet_image_by_rows(
+                excel_file, full_image, image_output_dir, header_index + 1,
+                rows_per_file=5, app=self._get_xw_app(),
+            )
+        except Exception as e:
+            logger.debug("按行裁剪图片失败: %s，改为切分表格后逐个转换 for %s", e, sheet_name)
+            image_files = self._render_flat_split_images(
+                excel_file, sheet_name, work_dir, header_index
+            )
+        logger.debug("生成图片数量: %d for %s", len(image_files), sheet_name)
+
+        return image_files
+
+    def _render_flat_split_images(
+            self, excel_file: str, sheet_name: str, work_dir: str, header_index: int
+    ) -> List[str]:
+        """
+        将扁平式布局的表格按行切分为多个Excel文件并逐个转换为图片
+
+        返回：
+            图片文件路径列表
+        """
         # 按行切分
         self._emit_status(f"正在切分表格: {sheet_name}")
         split_output_dir = os.path.join(work_dir, f"flat_split_{sheet_name}")
         os.makedirs(split_output_dir, exist_ok=True)
         split_excel_by_rows_with_header(
-            excel_file, split_output_dir, header_index + 1, rows_per_file=5
+            excel_file, split_output_dir, header_index + 1, rows_per_file=5,
+            app=self._get_xw_app(),
         )
 
         # 格式化所有切分后的文件
         self._emit_status(f"正在格式化表格: {sheet_name}")
-        formatted_files = format_excel_files_in_directory(split_output_dir)
+        formatted_files = format_excel_files_in_directory(
+            split_output_dir, app=self._get_xw_app()
+        )
 
         # 转换为图片
         self._emit_status(f"正在转换为图片: {sheet_name}")
@@ -342,65 +634,54 @@ class ExcelProcessHandler:
         os.makedirs(image_output_dir, exist_ok=True)
         convert_excel_to_images(formatted_files, image_output_dir)
 
-        # 返回所有图片文件路径
-        image_files = [
-            os.path.join(image_output_dir, f)
-            for f in os.listdir(image_output_dir)
-            if f.endswith(".png")
-        ]
-        print(f"生成图片数量: {len(image_files)} for {sheet_name}")
-
-        return image_files
+        # 返回本次生成的图片文件路径
+        return _collect_images(formatted_files, image_output_dir)
 
     def _process_block_layout(
             self,
             excel_file: str,
             sheet_name: str,
             work_dir: str,
-    ) -> dict:
+    ) -> List[str]:
         """
         处理分块布局的 Excel
 
         返回：
-            包含文件路径和 markdown 数据的字典
+            待提取数据的图片文件路径列表
         """
         # 格式化并转换为图片
         self._emit_status(f"正在格式化和转换: {sheet_name}")
         image_output = os.path.join(work_dir, f"block_image_{sheet_name}.png")
-        format_excel_and_convert_to_image(excel_file, image_output)
+        format_excel_and_convert_to_image(
+            excel_file, image_output, app=self._get_xw_app()
+        )
 
-        # 使用大模型提取数据
-        self._emit_status(f"正在提取数据: {sheet_name}")
-        markdown_content = extract_excel_data_to_markdown([image_output])
-        print(f"提取的 Markdown 内容长度: {len(markdown_content)} for {sheet_name}")
-
-        return {
-            "file": image_output,
-            "markdown": markdown_content,
-        }
+        return [image_output]
 
     def _process_master_detail_layout(
             self,
             excel_file: str,
             sheet_name: str,
             work_dir: str,
-    ) -> dict:
+    ) -> List[str]:
         """
         处理主表+子表布局的 Excel
 
         返回：
-            包含文件路径列表和 markdown 数据的字典
+            按起始行号排序的图片文件路径列表
         """
         # 1. 调整列宽
         self._emit_status(f"正在调整列宽: {sheet_name}")
         adjusted_file = os.path.join(work_dir, f"adjusted_{sheet_name}.xlsx")
-        auto_adjust_excel_column_width(excel_file, adjusted_file)
-        print(f"列宽调整完成: {adjusted_file}")
+        auto_adjust_excel_column_width(
+            excel_file, adjusted_file, app=self._get_xw_app()
+        )
+        logger.debug("列宽调整完成: %s", adjusted_file)
 
         # 2. 获取Excel行数
         self._emit_status(f"正在获取行数: {sheet_name}")
-        row_count = get_excel_row_count(adjusted_file)
-        print(f"Excel总行数: {row_count} for {sheet_name}")
+        row_count = get_excel_row_count(adjusted_file, app=self._get_xw_app())
+        logger.debug("Excel总行数: %d for %s", row_count, sheet_name)
 
         # 3. 计算每个文件的行数（按10份切分）
         if row_count <= 150:
@@ -409,70 +690,52 @@ class ExcelProcessHandler:
             rows_per_file = min(70, max(40, int(row_count / 6)))
         else:
             rows_per_file = min(80, max(40, int(row_count / (row_count // 70))))
-        print(f"每个文件行数: {rows_per_file}")
+        logger.debug("每个文件行数: %d", rows_per_file)
 
         # 4. 按行切分成多个Excel文件
         self._emit_status(f"正在切分表格: {sheet_name}")
         split_output_dir = os.path.join(work_dir, f"master_detail_split_{sheet_name}")
         os.makedirs(split_output_dir, exist_ok=True)
-        split_excel_by_rows(adjusted_file, split_output_dir, rows_per_file)
-        print(f"Excel切分完成: {split_output_dir}")
-
-        # 5. 获取切分后的文件列表（按文件名排序）
-        split_files = sorted([
-            os.path.join(split_output_dir, f)
-            for f in os.listdir(split_output_dir)
-            if f.endswith(".xlsx")
-        ])
-        print(f"切分后文件数量: {len(split_files)}")
-
-        # 6. 将所有Excel文件转换为图片
+        # 切分结果已按起始行排序
+        split_files = split_excel_by_rows(
+            adjusted_file, split_output_dir, rows_per_file, app=self._get_xw_app()
+        )
+        logger.debug("Excel切分完成: %s，文件数量: %d", split_output_dir, len(split_files))
+
+        # 5. 将所有Excel文件转换为图片
         self._emit_status(f"正在转换为图片: {sheet_name}")
         image_output_dir = os.path.join(work_dir, f"master_detail_images_{sheet_name}")
         os.makedirs(image_output_dir, exist_ok=True)
         convert_excel_to_images(split_files, image_output_dir)
 
-        # 7. 获取所有图片文件（按文件名中的起始行号排序）
-        import re
-
-        def extract_start_row(filename):
-            """从文件名中提取起始行号用于排序"""
-            match = re.search(r'rows_(\d+)_to_\d+\.png$', filename)
-            if match:
-                return int(match.group(1))
-            return 0
-
-        image_files = sorted(
-            [os.path.join(image_output_dir, f) for f in os.listdir(image_output_dir) if f.endswith(".png")],
-            key=lambda x: extract_start_row(os.path.basename(x))
-        )
-        print(f'图片:{[os.path.basename(f) for f in image_files]}')
-        print(f"生成图片数量: {len(image_files)}")
-
-        # 8. 按顺序将所有图片输入到大模型提取数据
-        self._emit_status(f"正在提取数据: {sheet_name}")
-        markdown_content = extract_excel_data_to_markdown(image_files)
-        print(f"提取的 Markdown 内容长度: {len(markdown_content)} for {sheet_name}")
+        # 6. 按切分顺序获取图片文件
+        image_files = _collect_images(split_files, image_output_dir)
+        logger.debug("生成图片数量: %d for %s", len(image_files), sheet_name)
 
-        return {
-            "files": image_files,
-            "markdown": markdown_content,
-        }
+        return image_files
 
-    def _extract_flat_layout_data(self, image_files: List[str]) -> List[Dict[str, Any]]:
+    def _extract_flat_layout_data(
+            self, image_files: List[str], display_file: str
+    ) -> List[Dict[str, Any]]:
         """
         从扁平式布局的图片中提取数据
 
         参数：
             image_files: 图片文件路径列表
+            display_file: 写入记录源文件字段的原始文件路径
 
         返回：
             提取的数据列表
         """
         from controllers.extract_data_controller import ExtractDataWorker
 
+        # 所有图片都来自同一个sheet，提取结果按图片名映射到同一个原始文件
+        file_mapping = {
+            os.path.splitext(os.path.basename(image_file))[0]: display_file
+            for image_file in image_files
+        }
         # 创建一个临时的提取工作线程（但不启动线程，直接调用方法）
-        worker = ExtractDataWorker(image_files)
+        worker = ExtractDataWorker(image_files, original_file_mapping=file_mapping)
 
         # 如果有状态信号，连接它
         if self.status_signal:
@@ -481,60 +744,60 @@ class ExcelProcessHandler:
         try:
             # 直接调用提取方法
             extracted_data = worker.extract_data_from_pdf(image_files)
-            print(f"扁平式布局数据提取完成，共 {len(extracted_data)} 条记录")
+            logger.debug("扁平式布局数据提取完成，共 %d 条记录", len(extracted_data))
             return extracted_data
         except Exception as e:
             error_msg = f"扁平式布局数据提取失败: {str(e)}"
-            print(error_msg)
             error_logger.error(error_msg)
             return []
 
+    def _markdown_to_json(self, markdown_content: str) -> Any:
+        """
+        将 markdown 内容交给文本模型转换为结构化数据
+
+        参数：
+            markdown_content: Markdown 内容
+
+        返回：
+            解析后的数据，失败时返回空字典
+        """
+        try:
+            return extract_info_from_md("", markdown_content)
+        except Exception as e:
+            error_msg = f"Markdown 转换为结构化数据失败: {str(e)}"
+            error_logger.error(error_msg)
+            return {}
+
     def _extract_block_layout_data(
-            self, markdown_content: str, file_path: str
+            self, parsed_data: Any, file_path: str
     ) -> List[Dict[str, Any]]:
         """
-        从分块布局的 markdown 内容中提取结构化数据
+        整理分块布局的结构化提取结果，并写入源文件字段
 
         参数：
-            markdown_content: Markdown 内容
+            parsed_data: 大模型返回的结构化数据
             file_path: 源文件路径
 
         返回：
             提取的数据列表
         """
         try:
-            # extract_info_from_md 返回的是 JSON 字符串，需要解析
-            json_result = extract_info_from_md("", markdown_content)
-            print(f"提取的 JSON 结果类型: {type(json_result)}")
-
-            # 如果返回的是字符串，解析为 Python 对象
-            if isinstance(json_result, str):
-                parsed_data = json.loads(json_result)
-            else:
-                parsed_data = json_result
-
-            # 提取费用明细列表
-            display_data = []
+            # 提取费用明细列表：字典优先取费用明细字段，没有时直接使用整个字典
             if isinstance(parsed_data, dict):
-                # 如果是字典，尝试提取费用明细
-                if "费用明细" in parsed_data:
-                    display_data = parsed_data["费用明细"]
-                else:
-                    # 如果没有费用明细字段，尝试直接使用整个字典
-                    display_data = [parsed_data]
+                records = parsed_data.get("费用明细", [parsed_data])
             elif isinstance(parsed_data, list):
-                display_data = parsed_data
+                records = parsed_data
+            else:
+                records = []
 
-            # 使用原始文件路径
+            # 使用原始文件路径，在同一次遍历中写入源文件字段
             display_file = self.original_file_mapping.get(file_path, file_path)
-            for item in display_data:
-                item["源文件"] = display_file
-            print(f"分块布局数据提取完成，共 {len(display_data)} 条记录")
+            display_data = [dict(item, 源文件=display_file) for item in records]
+            logger.debug("分块布局数据提取完成，共 %d 条记录", len(display_data))
             return display_data
 
         except Exception as e:
             error_msg = f"分块布局数据提取失败: {str(e)}"
-            print(error_msg)
             error_logger.error(error_msg)
             return []
 
@@ -548,52 +811,14 @@ class ExcelProcessHandler:
         返回：
             安全的文件名（仅包含ASCII字符）
         """
-        # 检查是否包含中文或其他非ASCII字符
-        has_non_ascii = not all(ord(char) < 128 for char in filename)
-
-        if not has_non_ascii:
-            # 如果文件名已经是纯ASCII，直接返回
+        # 如果文件名已经是纯ASCII（不含中文等字符），直接返回
+        if filename.isascii():
             return filename
 
         # 生成唯一的文件名：使用时间戳和UUID
-        import time
-
         timestamp = int(time.time() * 1000)  # 毫秒级时间戳
         unique_id = str(uuid.uuid4())[:8]  # 取UUID的前8位
 
         safe_name = f"excel_{timestamp}_{unique_id}"
-        print(f"中文文件名转换: '{filename}' -> '{safe_name}'")
+        logger.debug("中文文件名转换: '%s' -> '%s'", filename, safe_name)
         return safe_name
-
-    def _is_excel_empty(self, file_path: str) -> bool | None:
-        """
-        使用 xlwings 检查 Excel 文件是否为空（没有数据或只有空行）
-
-        参数：
-            file_path: Excel 文件路径
-
-        返回：
-            如果文件为空返回 True，否则返回 False
-        """
-        app = xw.App(visible=False)
-        try:
-            wb = app.books.open(file_path)
-            sheet = wb.sheets[0]
-
-            # 检查是否有任何非空单元格
-            used_range = sheet.used_range
-            if used_range.value:
-                for row in used_range.value:
-                    if any(cell is not None and str(cell).strip() for cell in row):
-                        return False
-
-            # 所有单元格都是空的
-            return True
-
-        except Exception as e:
-            print(f"检查 Excel 文件是否为空时出错: {file_path}, 错误: {str(e)}")
-            # 如果出错，假设文件不为空，继续处理
-            return False
-
-        finally:
-            app.quit()
@@ -1,7 +1,8 @@
-import json
 import os
 import shutil
+import threading
 import time
+import uuid
 from pathlib import Path
 from typing import List, Dict, Any
 from PySide6.QtCore import QThread, Signal
@@ -14,6 +15,35 @@ from utils.upload_file_to_oss import up_local_file
 logger = get_file_conversion_logger()
 error_logger = get_error_logger()
 
+# 解析金额时需要去除的货币符号和千分位分隔符
+_AMOUNT_TRANS = str.maketrans("", "", "¥$,")
+# 输出目录无法重命名时只能在后台原地删除，删除期间持有此锁，下一次解析前需等待
+_output_cleanup_lock = threading.Lock()
+
+
+def _remove_dirs(dir_paths: List[str]) -> None:
+    """删除目录列表，在后台线程中执行
+
+    Args:
+        dir_paths: 要删除的目录路径列表
+    """
+    for dir_path in dir_paths:
+        shutil.rmtree(dir_path, ignore_errors=True)
+        logger.debug("删除临时文件夹 %s", dir_path)
+
+
+def _remove_output_in_place(dir_path: str) -> None:
+    """在后台线程中原地删除无法重命名的输出目录，完成后释放 _output_cleanup_lock
+
+    Args:
+        dir_path: 输出目录路径
+    """
+    try:
+        shutil.rmtree(dir_path, ignore_errors=True)
+        logger.debug("删除临时文件夹 %s", dir_path)
+    finally:
+        _output_cleanup_lock.release()
+
 
 class ExtractDataWorker(QThread):
     """数据提取工作线程
@@ -102,24 +132,28 @@ class ExtractDataWorker(QThread):
             提取的数据列表
         """
         try:
-            fixed_paths = []
             for path in file_paths:
                 if not os.path.exists(path):
                     raise FileNotFoundError(f"文件不存在: {path}")
 
+            # 扩展名为大写的文件统一改为小写，先收集再批量重命名
+            renames = {}
+            for idx, path in enumerate(file_paths):
                 root, ext = os.path.splitext(path)
                 if ext.isupper():
-                    new_path = root + ext.lower()
+                    renames[idx] = (path, root + ext.lower())
+
+            if renames:
+                file_paths = list(file_paths)
+                for idx, (path, new_path) in renames.items():
+                    # 目标已存在时（包括不区分大小写的文件系统）无需重命名
                     if not os.path.exists(new_path):
                         try:
                             os.rename(path, new_path)
                         except OSError as e:
-                            raise OSError(f"重命名文件失败 {path}: {str(e)}")
-                    fixed_paths.append(new_path)
-                else:
-                    fixed_paths.append(path)
-
-            file_paths = fixed_paths
+                            logger.error(f"重命名文件失败 {path}: {str(e)}")
+                            continue
+                    file_paths[idx] = new_path
             os.environ["MINERU_MODEL_SOURCE"] = "local"
         except Exception as e:
             error_msg = f"预处理文件失败: {str(e)}"
@@ -133,6 +167,9 @@ class ExtractDataWorker(QThread):
             # 使用项目根目录下的 output 文件夹
             root_dir = Path(__file__).resolve().parents[1]
             output_dir = root_dir / "output"
+            # 等待上一次原地删除输出目录完成，避免删除刚生成的解析结果
+            with _output_cleanup_lock:
+                pass
             parse_doc(
                 path_list=file_paths, output_dir=str(output_dir), backend="pipeline"
             )
@@ -182,25 +219,35 @@ class ExtractDataWorker(QThread):
 
         corrector = TableCorrector(API_KEY, status_callback=status_callback)
         result = corrector.process_directory(OUTPUT_DIR)
-        info_dict = result.get("info_dict", {})
-
-        # 如果info_dict是字符串，尝试解析为JSON
-        if isinstance(info_dict, str):
-            try:
-                info_dict = json.loads(info_dict)
-            except json.JSONDecodeError:
-                info_dict = {}
-
-        return info_dict
+        return result.get("info_dict", {})
 
     def _cleanup_temp_files(self) -> None:
-        """清理临时文件"""
+        """清理临时文件
+
+        先将输出目录重命名再在后台线程中删除，当前线程无需等待，
+        下一次解析也不会与删除操作冲突
+        """
         # 使用项目根目录下的 output 文件夹
         root_dir = Path(__file__).resolve().parents[1]
         output_dir = root_dir / "output"
         if output_dir.exists():
-            shutil.rmtree(str(output_dir))
-            print(f"删除临时文件夹 {output_dir}")
+            trash_dir = root_dir / f"output.old.{uuid.uuid4().hex}"
+            try:
+                os.replace(output_dir, trash_dir)
+            except OSError:
+                # 无法重命名（如文件被占用）时在后台原地删除，锁在启动线程前获取，
+                # 由删除线程释放，下一次解析会等待删除完成
+                _output_cleanup_lock.acquire()
+                threading.Thread(
+                    target=_remove_output_in_place, args=(str(output_dir),), daemon=True
+                ).start()
+
+        # 同时清理之前未删除完成的目录
+        stale_dirs = [str(path) for path in root_dir.glob("output.old.*")]
+        if stale_dirs:
+            threading.Thread(
+                target=_remove_dirs, args=(stale_dirs,), daemon=True
+            ).start()
 
     def _process_extracted_data(
         self,
@@ -228,14 +275,7 @@ class ExtractDataWorker(QThread):
             for record in records:
                 amount = record.get("金额", "")
                 if amount:
-                    amount_str = (
-                        str(amount)
-                        .strip()
-                        .replace("¥", "")
-                        .replace("$", "")
-                        .replace(",", "")
-                    )
-                    amount_value = float(amount_str)
+                    amount_value = float(str(amount).translate(_AMOUNT_TRANS).strip())
                     if abs(amount_value) < 0.001:
                         continue
                 record["源文件"] = source_file
@@ -1,16 +1,318 @@
-﻿import os
+﻿import errno
+import hashlib
+import os
 import shutil
-from typing import List, Tuple, Dict, Any
+import stat
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Tuple, Dict, Any, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows 下没有 fcntl，复制时使用 shutil.copy2
+    fcntl = None
 from PySide6.QtCore import QThread, Signal
 
-from utils.file_to_pdf import docx_to_pdf, rtf_to_pdf
-from utils.logger import get_file_conversion_logger, get_error_logger, upload_all_logs
+from utils.file_to_pdf import docx_to_pdf, rtf_to_pdf, WordPdfSession
+from utils.logger import get_file_conversion_logger, get_error_logger
 from controllers.excel_process_controller import ExcelProcessHandler
 
 # 使用统一的日志系统（与 upload_controller 共享日志文件）
 logger = get_file_conversion_logger()
 error_logger = get_error_logger()
 
+# 直接复制到输出目录的文件类型
+_COPY_EXTS = frozenset({".pdf", ".jpg", ".jpeg", ".png"})
+# 需要转换为PDF的文档类型
+_DOCUMENT_EXTS = frozenset({".docx", ".rtf"})
+# 先收集再批量处理的Excel文件类型
+_EXCEL_EXTS = frozenset({".xls", ".xlsx"})
+# Linux 下使用 sendfile 在内核中直接复制文件数据
+_USE_SENDFILE = hasattr(os, "sendfile") and sys.platform.startswith("linux")
+# Linux 4.5+ 支持 copy_file_range，同一文件系统内可由文件系统直接复制
+_USE_COPY_FILE_RANGE = _USE_SENDFILE and hasattr(os, "copy_file_range")
+# Word/RTF 转换结果缓存目录，按文档摘要命名；每次处理前会清空输出目录，因此单独存放
+_PDF_CACHE_DIR = os.path.join("cache", "pdf")
+# 计算缓存键时读取的文档开头字节数
+_PDF_CACHE_HEAD_BYTES = 64 * 1024
+# 缓存文件的最长保留时间（秒）和缓存目录的总大小上限（字节）
+_PDF_CACHE_MAX_AGE = 30 * 24 * 3600
+_PDF_CACHE_MAX_BYTES = 512 * 1024 * 1024
+# 复制状态的最短发送间隔（秒）
+_STATUS_INTERVAL = 0.1
+# 内核复制均不可用时的缓冲区大小
+_COPY_BUFSIZE = 1024 * 1024
+# ioctl FICLONE：在支持 reflink 的文件系统上以写时复制方式克隆文件
+_FICLONE = 0x40049409
+# 文件系统或内核不支持某种复制方式时返回的错误码，遇到时换用下一种方式
+_FALLBACK_ERRNOS = {
+    errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTTY, errno.ENOSYS,
+    errno.EBADF, errno.EPERM,
+}
+
+
+def _stat_nonempty(path: str) -> bool:
+    """判断路径是否为非空的普通文件，只调用一次 stat
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        文件存在、是普通文件且大小不为0时返回 True
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return st.st_size > 0 and stat.S_ISREG(st.st_mode)
+
+
+def _copy_fd_data(src_fd: int, dst_fd: int) -> None:
+    """在内核中复制文件数据
+
+    依次尝试 FICLONE（btrfs/XFS 等支持 reflink 的文件系统上只共享数据块，不复制数据）、
+    copy_file_range 和 sendfile，前一种方式不被支持时换用下一种，最后使用缓冲区复制。
+
+    Args:
+        src_fd: 源文件描述符
+        dst_fd: 目标文件描述符（已截断为空）
+    """
+    try:
+        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        return
+    except OSError as e:
+        if e.errno not in _FALLBACK_ERRNOS:
+            raise
+
+    if _USE_COPY_FILE_RANGE:
+        copied = 0
+        try:
+            while True:
+                n = os.copy_file_range(src_fd, dst_fd, 1 << 30)
+                if n == 0:
+                    return
+                copied += n
+        except OSError as e:
+            # 已复制部分数据后出错不再回退，避免目标文件内容错位
+            if copied or e.errno not in _FALLBACK_ERRNOS:
+                raise
+
+    offset = 0
+    try:
+        while True:
+            sent = os.sendfile(dst_fd, src_fd, offset, 1 << 30)
+            if sent == 0:
+                return
+            offset += sent
+    except OSError as e:
+        if offset or e.errno not in _FALLBACK_ERRNOS:
+            raise
+
+    # 以上方式都不可用时，使用 1MB 缓冲区在用户空间复制
+    buf = bytearray(_COPY_BUFSIZE)
+    view = memoryview(buf)
+    with open(src_fd, "rb", buffering=0, closefd=False) as fsrc, \
+            open(dst_fd, "wb", buffering=0, closefd=False) as fdst:
+        while True:
+            n = fsrc.readinto(buf)
+            if not n:
+                break
+            fdst.write(view[:n])
+
+
+def _scan_input_sizes(file_paths: List[str]) -> Dict[str, int]:
+    """读取一次输入文件所在目录，获取各输入文件的大小
+
+    Windows 下目录项自带文件大小，DirEntry.stat() 无需再逐个访问文件；
+    输入文件不在同一目录或读取失败时返回空字典，由调用方逐个 stat。
+
+    Args:
+        file_paths: 输入文件路径列表
+
+    Returns:
+        规范化绝对路径 -> 文件大小，只包含输入文件中的普通文件
+    """
+    wanted = {os.path.normcase(os.path.abspath(path)) for path in file_paths}
+    parents = {os.path.dirname(path) for path in wanted}
+    if len(parents) != 1:
+        return {}
+
+    sizes = {}
+    try:
+        with os.scandir(parents.pop()) as entries:
+            for entry in entries:
+                key = os.path.normcase(entry.path)
+                if key in wanted and entry.is_file():
+                    sizes[key] = entry.stat().st_size
+    except OSError:
+        return {}
+    return sizes
+
+
+def _fast_copy(src: str, dst: str) -> None:
+    """复制文件内容和元数据
+
+    Linux 下在内核中复制，数据不经过用户空间，详见 _copy_fd_data；其他平台使用
+    shutil.copy2（Windows 下已使用 1MB 缓冲区复制）。
+
+    Args:
+        src: 源文件路径
+        dst: 目标文件路径
+    """
+    if not _USE_SENDFILE:
+        shutil.copy2(src, dst)
+        return
+
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            _copy_fd_data(src_fd, dst_fd)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    shutil.copystat(src, dst)
+
+
+def _pdf_cache_key(file_path: str) -> str:
+    """计算文档转换结果的缓存键
+
+    只读取文档开头的一部分，再结合文件大小和修改时间，避免每次都读取整个文档。
+
+    Args:
+        file_path: 文档路径
+
+    Returns:
+        十六进制缓存键
+    """
+    st = os.stat(file_path)
+    h = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        h.update(f.read(_PDF_CACHE_HEAD_BYTES))
+    h.update(f"{st.st_size}:{st.st_mtime_ns}".encode("ascii"))
+    return h.hexdigest()
+
+
+def _prune_pdf_cache() -> None:
+    """清理PDF缓存：删除超过保留时间的文件，总大小超过上限时从最久未使用的文件开始删除"""
+    try:
+        with os.scandir(_PDF_CACHE_DIR) as entries:
+            files = [
+                (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                for entry in entries if entry.is_file()
+            ]
+    except OSError:
+        return
+
+    expire_before = time.time() - _PDF_CACHE_MAX_AGE
+    total = sum(size for _, size, _ in files)
+    for mtime, size, path in sorted(files):
+        if mtime >= expire_before and total <= _PDF_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def _save_converted_pdf(pdf_path: str, cached_pdf: str) -> None:
+    """将转换结果保存到缓存目录，失败时忽略
+
+    Args:
+        pdf_path: 转换生成的PDF路径
+        cached_pdf: 缓存文件路径
+    """
+    try:
+        os.makedirs(_PDF_CACHE_DIR, exist_ok=True)
+        # 先写临时文件再替换，避免读取到不完整的缓存
+        tmp_path = f"{cached_pdf}.tmp"
+        _fast_copy(pdf_path, tmp_path)
+        os.replace(tmp_path, cached_pdf)
+    except OSError as e:
+        logger.debug("保存PDF缓存失败: %s", e)
+
+
+def _fast_rmtree(path: str) -> None:
+    """删除目录树
+
+    使用 os.scandir 遍历（目录项自带类型信息，无需逐个查询文件状态），
+    文件在线程池中并行删除，最后自底向上删除目录。
+
+    Args:
+        path: 要删除的目录路径
+    """
+    files = []
+    dirs = []
+    pending = [path]
+    while pending:
+        current = pending.pop()
+        dirs.append(current)
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                else:
+                    files.append(entry.path)
+
+    if files:
+        with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+            # 遍历结果以便删除失败时抛出异常
+            for _ in executor.map(os.unlink, files):
+                pass
+
+    # 子目录总是在父目录之后加入列表，逆序删除即为自底向上
+    for dir_path in reversed(dirs):
+        os.rmdir(dir_path)
+
+
+def _remove_dirs_quietly(dir_paths: List[str]) -> None:
+    """在后台线程中删除目录，失败时忽略
+
+    Args:
+        dir_paths: 要删除的目录列表
+    """
+    for dir_path in dir_paths:
+        try:
+            _fast_rmtree(dir_path)
+        except OSError:
+            shutil.rmtree(dir_path, ignore_errors=True)
+
+
+def _discard_dir(path: str) -> None:
+    """清空输出目录
+
+    先将目录重命名（同一文件系统内为原子操作），再在后台线程中删除，
+    调用方可以立即重新创建同名目录；之前未删除完成的目录一并清理。
+
+    Args:
+        path: 要清空的目录路径
+    """
+    path = os.path.normpath(path)
+    try:
+        os.replace(path, f"{path}.old.{uuid.uuid4().hex}")
+    except OSError:
+        # 无法重命名（如文件被占用）时直接删除
+        _fast_rmtree(path)
+
+    parent = os.path.dirname(path) or "."
+    prefix = f"{os.path.basename(path)}.old."
+    with os.scandir(parent) as entries:
+        stale_dirs = [
+            entry.path for entry in entries
+            if entry.name.startswith(prefix) and entry.is_dir(follow_symlinks=False)
+        ]
+    if stale_dirs:
+        threading.Thread(
+            target=_remove_dirs_quietly, args=(stale_dirs,), daemon=True
+        ).start()
+
+
 class DocumentConversionWorker(QThread):
     """文档转换工作线程"""
 
@@ -26,15 +328,22 @@ class DocumentConversionWorker(QThread):
         self.file_paths = file_paths
         self.output_dir = output_dir
         self.original_file_mapping = original_file_mapping or {}  # 临时文件路径 -> 原始文件路径
+        # 所有 Word/RTF 文档共用的 Word 会话，首次转换文档时才启动
+        self._word_session: Optional[WordPdfSession] = None
+        # 输入文件大小，由 _scan_input_sizes 一次读取，键为规范化的绝对路径
+        self._input_sizes: Dict[str, int] = {}
+        # 复制状态的上次发送时间，复制很快时限制发送频率，避免信号排满界面线程
+        self._last_copy_status = 0.0
+        self._copy_status_lock = threading.Lock()
 
     def run(self):
         """执行文档转换"""
         try:
             self.status_updated.emit("正在转换文件格式，请稍候...")
 
-            # 创建输出目录
+            # 创建输出目录，旧目录移走后在后台删除，转换无需等待
             if os.path.exists(self.output_dir):
-                shutil.rmtree(self.output_dir)
+                _discard_dir(self.output_dir)
             os.makedirs(self.output_dir)
 
             # 执行转换 - 修复：不传递参数，直接调用
@@ -54,6 +363,8 @@ class DocumentConversionWorker(QThread):
         except Exception as e:
             error_msg = f"文档转换失败: {str(e)}"
             self.conversion_finished.emit([], {}, False, error_msg, {})
+        finally:
+            self._close_word_session()
 
     def _convert_documents_and_copy_files(
             self,
@@ -63,114 +374,90 @@ class DocumentConversionWorker(QThread):
         Returns:
             (转换后的文件路径列表, 文件名映射字典, Excel处理结果)
         """
-        converted_files = []
-        file_mapping = {}  # 转换后PDF文件名(无扩展名) -> 原始文件路径
         excel_result = {"excel_data": [], "type": None}  # Excel 特殊处理结果
         excel_files = []  # 收集所有Excel文件
 
-        for file_path in self.file_paths:
+        # 每个输入文件的输出路径，失败时为 None，按输入顺序保存
+        outputs: List[Union[Future, str, None]] = [None] * len(self.file_paths)
+        max_workers = max(1, min(len(self.file_paths), os.cpu_count() or 4))
+        self._input_sizes = _scan_input_sizes(self.file_paths)
+        _prune_pdf_cache()
+
+        # 一次遍历按处理方法分组，组内保持输入顺序；同时按输出文件名归类，
+        # 如 a.docx 和 a.pdf 都会输出为 a.pdf
+        groups = defaultdict(list)
+        targets = defaultdict(list)  # 输出文件名 -> 输入位置列表
+        handlers = {}  # 输入位置 -> 处理方法
+        get_handler, splitext = _HANDLERS.get, os.path.splitext
+        copy_handler = DocumentConversionWorker._handle_copy
+        excel_handler = DocumentConversionWorker._handle_excel
+        for idx, file_path in enumerate(self.file_paths):
+            handler = get_handler(splitext(file_path)[1].lower())
+            if handler is None:
+                continue
+            if handler is excel_handler:
+                groups[handler].append(idx)
+                continue
+            handlers[idx] = handler
             filename = os.path.basename(file_path)
-            name, ext = os.path.splitext(filename)
-            ext_lower = ext.lower()
-
-            # 发送当前文件转换状态
-            self.status_updated.emit(f"正在转换文件: {filename}")
-
-            if ext_lower in [".docx"]:
-                # 转换Word文档
-                try:
-                    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
-                        raise ValueError(f"Word文档文件不存在或为空: {filename}")
-
-                    output_pdf_path = os.path.join(self.output_dir, f"{name}.pdf")
-                    docx_to_pdf(file_path, output_pdf_path)
-
-                    # 检查转换结果
-                    if (
-                            not os.path.exists(output_pdf_path)
-                            or os.path.getsize(output_pdf_path) == 0
-                    ):
-                        raise ValueError(f"Word文档转换后的PDF文件为空或未生成")
-
-                    converted_files.append(output_pdf_path)
-                    # 使用原始文件路径建立映射
-                    original_path = self.original_file_mapping.get(file_path, file_path)
-                    file_mapping[name] = original_path
-                    print(f"Word文档转换成功: {filename} -> {name}.pdf")
-                except Exception as e:
-                    error_msg = f"Word文档转换失败 {filename}: {str(e)}"
-                    print(error_msg)
-                    error_logger.error(error_msg)
-                    continue
-
-            elif ext_lower in [".xls", ".xlsx"]:
-                # Excel文件先收集，稍后批量处理
-                try:
-                    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
-                        raise ValueError(f"Excel文档文件不存在或为空: {filename}")
-                    excel_files.append((file_path, name))
-                    print(f"收集Excel文件: {filename}")
-                except Exception as e:
-                    error_msg = f"Excel文件检查失败 {filename}: {str(e)}"
-                    print(error_msg)
-                    error_logger.error(error_msg)
-                    continue
-
-            elif ext_lower in [".rtf"]:
-                try:
-                    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
-                        raise ValueError(f"RTF文档文件不存在或为空: {filename}")
-
-                    output_pdf_path = os.path.join(self.output_dir, f"{name}.pdf")
-                    rtf_to_pdf(file_path, output_pdf_path)
-
-                    # 检查转换结果
-                    if (
-                            not os.path.exists(output_pdf_path)
-                            or os.path.getsize(output_pdf_path) == 0
-                    ):
-                        raise ValueError(f"RTF文档转换后的PDF文件为空或未生成")
-
-                    converted_files.append(output_pdf_path)
-                    # 使用原始文件路径建立映射
-                    original_path = self.original_file_mapping.get(file_path, file_path)
-                    file_mapping[name] = original_path
-                    print(f"RTF文档转换成功: {filename} -> {name}.pdf")
-                except Exception as e:
-                    error_msg = f"RTF文档转换失败 {filename}: {str(e)}"
-                    print(error_msg)
-                    error_logger.error(error_msg)
-                    continue
-
-            elif ext_lower in [".pdf", ".jpg", ".jpeg", ".png"]:
-                # 直接复制PDF和图片文件
-                try:
-                    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
-                        raise ValueError(f"文件不存在或为空: {filename}")
-
-                    dest_path = os.path.join(self.output_dir, filename)
-                    shutil.copy2(file_path, dest_path)
-
-                    # 检查复制结果
-                    if not os.path.exists(dest_path) or os.path.getsize(dest_path) == 0:
-                        raise ValueError(f"文件复制失败或复制后文件为空: {filename}")
-
-                    converted_files.append(dest_path)
-                    # 对于直接复制的文件，也建立映射关系，使用原始文件路径
-                    original_path = self.original_file_mapping.get(file_path, file_path)
-                    file_mapping[name] = original_path
-                    print(f"文件复制成功: {filename}")
-                except Exception as e:
-                    error_msg = f"文件复制失败 {filename}: {str(e)}"
-                    print(error_msg)
-                    error_logger.error(error_msg)
-                    continue
+            output_name = filename if handler is copy_handler else f"{splitext(filename)[0]}.pdf"
+            targets[os.path.normcase(output_name)].append(idx)
+
+        # 输出文件名冲突的文件不能并行处理，留到最后按输入顺序依次处理，
+        # 与逐个处理时一样由排在后面的文件覆盖前面的
+        collided = []
+        for indexes in targets.values():
+            if len(indexes) > 1:
+                collided.extend(indexes)
+            else:
+                groups[handlers[indexes[0]]].append(indexes[0])
+        collided.sort()
+        if collided:
+            logger.debug(
+                "输出文件名冲突，按输入顺序依次处理: %s",
+                [os.path.basename(self.file_paths[idx]) for idx in collided],
+            )
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # 先提交全部复制任务，线程池在依次转换文档期间一直有任务可做
+            for handler in _HANDLER_ORDER:
+                for idx in groups.get(handler, ()):
+                    outputs[idx] = handler(self, self.file_paths[idx], executor, excel_files)
+
+            # 复制任务在线程池中执行，等待其结果
+            outputs = [
+                output.result() if isinstance(output, Future) else output
+                for output in outputs
+            ]
+
+        for idx in collided:
+            file_path = self.file_paths[idx]
+            if handlers[idx] is copy_handler:
+                outputs[idx] = self._copy_file(file_path)
+            else:
+                outputs[idx] = self._convert_document(file_path)
+
+        # 文档已全部转换完成，退出 Word 后再处理Excel
+        self._close_word_session()
+
+        # 各输出已按输入顺序收集，一次性生成结果列表和映射，失败的文件不计入
+        succeeded = [
+            (file_path, output_path)
+            for file_path, output_path in zip(self.file_paths, outputs)
+            if output_path
+        ]
+        converted_files = [output_path for _, output_path in succeeded]
+        # 转换后PDF文件名(无扩展名) -> 原始文件路径
+        original_path = self.original_file_mapping.get
+        splitext, basename = os.path.splitext, os.path.basename
+        file_mapping = {
+            splitext(basename(file_path))[0]: original_path(file_path, file_path)
+            for file_path, _ in succeeded
+        }
 
         # 批量处理所有Excel文件
         if excel_files:
-            print(f"\n{'=' * 60}")
-            print(f"开始批量处理 {len(excel_files)} 个Excel文件")
-            print(f"{'=' * 60}\n")
+            logger.debug("开始批量处理 %d 个Excel文件", len(excel_files))
 
             # 使用 ExcelProcessHandler 处理Excel文件，传递原始文件映射
             excel_handler = ExcelProcessHandler(
@@ -183,25 +470,167 @@ class DocumentConversionWorker(QThread):
             if batch_result:
                 converted_files.extend(batch_result.get("files", []))
 
-                # 建立映射关系
-                for result_file in batch_result.get("files", []):
-                    result_name = os.path.splitext(os.path.basename(result_file))[0]
-                    # 从批量结果中找到对应的原始文件
-                    original_file = batch_result.get("file_mapping", {}).get(
-                        result_name
-                    )
-                    if original_file:
-                        file_mapping[result_name] = original_file
+                # 建立映射关系，批量结果中已按结果文件名(无扩展名)记录了原始文件
+                file_mapping.update(batch_result.get("file_mapping", {}))
 
                 # 合并Excel数据
                 if batch_result.get("excel_data"):
                     excel_result["excel_data"].extend(batch_result["excel_data"])
                     excel_result["type"] = batch_result.get("type")
 
-                print(f"\n{'=' * 60}")
-                print(
-                    f"Excel批量处理完成: 提取 {len(batch_result.get('excel_data', []))} 条数据"
+                logger.debug(
+                    "Excel批量处理完成: 提取 %d 条数据", len(batch_result.get("excel_data", []))
                 )
-                print(f"{'=' * 60}\n")
 
         return converted_files, file_mapping, excel_result
+
+    def _handle_copy(
+            self, file_path: str, executor: ThreadPoolExecutor, excel_files: List[Tuple[str, str]]
+    ) -> Future:
+        """复制文件在线程池中并行执行，返回复制任务"""
+        return executor.submit(self._copy_file, file_path)
+
+    def _handle_document(
+            self, file_path: str, executor: ThreadPoolExecutor, excel_files: List[Tuple[str, str]]
+    ) -> Optional[str]:
+        """Word/RTF 通过 Word 转换，同一时间只能转换一个文件，
+        在当前线程中依次执行，与复制任务重叠"""
+        return self._convert_document(file_path)
+
+    def _handle_excel(
+            self, file_path: str, executor: ThreadPoolExecutor, excel_files: List[Tuple[str, str]]
+    ) -> None:
+        """Excel文件先收集，稍后批量处理"""
+        filename = os.path.basename(file_path)
+        self.status_updated.emit(f"正在转换文件: {filename}")
+        if not self._input_nonempty(file_path):
+            error_logger.error(f"Excel文件检查失败 {filename}: Excel文档文件不存在或为空: {filename}")
+            return None
+        excel_files.append((file_path, os.path.splitext(filename)[0]))
+        logger.debug("收集Excel文件: %s", filename)
+        return None
+
+    def _convert_document(self, file_path: str) -> Optional[str]:
+        """将Word或RTF文档转换为PDF
+
+        Args:
+            file_path: 文档路径
+
+        Returns:
+            生成的PDF路径，失败时返回 None
+        """
+        filename = os.path.basename(file_path)
+        name, ext = os.path.splitext(filename)
+        if ext.lower() == ".docx":
+            label, converter = "Word", docx_to_pdf
+        else:
+            label, converter = "RTF", rtf_to_pdf
+
+        # 发送当前文件转换状态
+        self.status_updated.emit(f"正在转换文件: {filename}")
+        try:
+            if not self._input_nonempty(file_path):
+                raise ValueError(f"{label}文档文件不存在或为空: {filename}")
+
+            output_pdf_path = os.path.join(self.output_dir, f"{name}.pdf")
+            # 内容未变的文档直接使用上次转换的结果，不再启动 Word
+            cached_pdf = os.path.join(_PDF_CACHE_DIR, f"{_pdf_cache_key(file_path)}.pdf")
+            if _stat_nonempty(cached_pdf):
+                _fast_copy(cached_pdf, output_pdf_path)
+                # 更新修改时间，清理缓存时最近使用过的文件最后删除
+                os.utime(cached_pdf)
+                logger.debug("%s文档使用已转换的PDF: %s -> %s.pdf", label, filename, name)
+                return output_pdf_path
+
+            if self._word_session is None and WordPdfSession.available():
+                self._word_session = WordPdfSession()
+            converter(file_path, output_pdf_path, session=self._word_session)
+
+            # 检查转换结果
+            if not _stat_nonempty(output_pdf_path):
+                raise ValueError(f"{label}文档转换后的PDF文件为空或未生成")
+
+            logger.debug("%s文档转换成功: %s -> %s.pdf", label, filename, name)
+            _save_converted_pdf(output_pdf_path, cached_pdf)
+            return output_pdf_path
+        except Exception as e:
+            error_msg = f"{label}文档转换失败 {filename}: {str(e)}"
+            error_logger.error(error_msg)
+            return None
+
+    def _close_word_session(self) -> None:
+        """退出转换文档使用的 Word 进程"""
+        if self._word_session is not None:
+            self._word_session.close()
+            self._word_session = None
+
+    def _input_nonempty(self, file_path: str) -> bool:
+        """判断输入文件是否为非空文件，优先使用目录扫描得到的大小
+
+        Args:
+            file_path: 输入文件路径
+
+        Returns:
+            文件存在且大小不为0时返回 True
+        """
+        size = self._input_sizes.get(os.path.normcase(os.path.abspath(file_path)))
+        if size is not None:
+            return size > 0
+        return _stat_nonempty(file_path)
+
+    def _emit_copy_status(self, filename: str) -> None:
+        """发送复制状态，两次发送至少间隔 _STATUS_INTERVAL 秒，在线程池中调用
+
+        Args:
+            filename: 正在复制的文件名
+        """
+        now = time.monotonic()
+        with self._copy_status_lock:
+            if now - self._last_copy_status < _STATUS_INTERVAL:
+                return
+            self._last_copy_status = now
+        # 信号可跨线程发送，由 Qt 排队到接收者所在线程
+        self.status_updated.emit(f"正在转换文件: {filename}")
+
+    def _copy_file(self, file_path: str) -> Optional[str]:
+        """直接复制PDF和图片文件到输出目录，在线程池中执行
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            复制后的文件路径，失败时返回 None
+        """
+        filename = os.path.basename(file_path)
+        self._emit_copy_status(filename)
+        try:
+            if not self._input_nonempty(file_path):
+                raise ValueError(f"文件不存在或为空: {filename}")
+
+            dest_path = os.path.join(self.output_dir, filename)
+            _fast_copy(file_path, dest_path)
+
+            # 检查复制结果
+            if not _stat_nonempty(dest_path):
+                raise ValueError(f"文件复制失败或复制后文件为空: {filename}")
+
+            logger.debug("文件复制成功: %s", filename)
+            return dest_path
+        except Exception as e:
+            error_msg = f"文件复制失败 {filename}: {str(e)}"
+            error_logger.error(error_msg)
+            return None
+
+
+# 按扩展名分派处理方法，模块加载时构建一次
+_HANDLERS = {
+    **dict.fromkeys(_COPY_EXTS, DocumentConversionWorker._handle_copy),
+    **dict.fromkeys(_DOCUMENT_EXTS, DocumentConversionWorker._handle_document),
+    **dict.fromkeys(_EXCEL_EXTS, DocumentConversionWorker._handle_excel),
+}
+# 各组的处理顺序：复制任务只需提交，Excel 只需收集，耗时的文档转换放在最后
+_HANDLER_ORDER = (
+    DocumentConversionWorker._handle_copy,
+    DocumentConversionWorker._handle_excel,
+    DocumentConversionWorker._handle_document,
+)
@@ -5,9 +5,11 @@
 
 import os
 import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 from PySide6.QtWidgets import QFileDialog, QMessageBox, QHBoxLayout, QPushButton
 from PySide6.QtCore import QObject, Signal, QThread, Qt
 
@@ -21,6 +23,42 @@ from utils.upload_file_to_oss import up_local_file
 logger = get_upload_logger()
 error_logger = get_error_logger()
 
+# 不同类型文件在OSS中的存放前缀
+_OSS_PREFIX_BASE = "chatbot_25_0528/muai-models/cost_ident"
+_OSS_PREFIXES = {
+    ".pdf": f"{_OSS_PREFIX_BASE}/pdf_file",
+    ".doc": f"{_OSS_PREFIX_BASE}/doc_file",
+    ".docx": f"{_OSS_PREFIX_BASE}/doc_file",
+    ".rtf": f"{_OSS_PREFIX_BASE}/doc_file",
+    ".xls": f"{_OSS_PREFIX_BASE}/excel_file",
+    ".xlsx": f"{_OSS_PREFIX_BASE}/excel_file",
+    ".jpg": f"{_OSS_PREFIX_BASE}/image_file",
+    ".jpeg": f"{_OSS_PREFIX_BASE}/image_file",
+    ".png": f"{_OSS_PREFIX_BASE}/image_file",
+    ".bmp": f"{_OSS_PREFIX_BASE}/image_file",
+}
+# 同时上传的文件数
+_UPLOAD_WORKERS = 8
+
+def _upload_file_to_oss(file: str) -> str:
+    """按文件类型上传单个文件到OSS
+
+    Args:
+        file: 本地文件路径
+
+    Returns:
+        OSS对象键
+    """
+    file_extension = Path(file).suffix.lower()
+    object_prefix = _OSS_PREFIXES.get(file_extension, f"{_OSS_PREFIX_BASE}/other_file")
+    try:
+        res = up_local_file(local_file_path=file, object_prefix=object_prefix)
+    except Exception as e:
+        error_logger.error(f"上传文件 {file} 到OSS失败: {str(e)}")
+        raise
+    logger.info(f"上传文件 {file} 成功，OSS对象键: {res}")
+    return res
+
 class UploadController(QObject):
     """上传功能控制器
 
@@ -35,6 +73,8 @@ class UploadController(QObject):
     file_processed = Signal()
     processing_started = Signal()
     processing_finished = Signal()
+    # 后台上传OSS有文件失败时发出，参数为失败说明；在上传线程中发出，排队到界面线程处理
+    upload_failed = Signal(str)
 
     def __init__(self, view, data_manager):
         """初始化上传控制器
@@ -52,6 +92,13 @@ class UploadController(QObject):
         self.file_path_mapping: Dict[str, str] = (
             {}
         )  # 临时文件路径 -> 原始文件路径的映射
+        # 后台上传OSS的线程池
+        self._upload_executor: Optional[ThreadPoolExecutor] = None
+        # 正在上传的临时文件 -> 未完成的上传次数，以及清理时因仍在上传而暂缓删除的文件；
+        # 上传回调在线程池中执行，访问时需持有锁
+        self._upload_lock = threading.Lock()
+        self._uploading: Dict[str, int] = {}
+        self._delete_after_upload: set = set()
         self._setup_controller()
         self._ensure_temp_directory()
 
@@ -84,6 +131,9 @@ class UploadController(QObject):
             # 获取原始文件名和扩展名
             original_name = os.path.basename(original_file_path)
             temp_file_path = self.temp_dir / original_name
+            # 重新添加的同名文件不能在之前的上传完成后被删除
+            with self._upload_lock:
+                self._delete_after_upload.discard(str(temp_file_path))
             # 复制文件
             shutil.copy2(original_file_path, temp_file_path)
             temp_file_path_str = str(temp_file_path)
@@ -630,37 +680,8 @@ class UploadController(QObject):
         self.view.title.setText("正在提取识别中，请稍候...")
         self.view.title.setStyleSheet("color: red; font-weight: bold; font-size: 20px;")
 
-        # TODO：上传文件到OSS
-        logger.info("开始上传文件到OSS")
-        for file in self.uploaded_files:
-            file_extension = Path(file).suffix.lower()
-            if file_extension in [".pdf"]:
-                res = up_local_file(
-                    local_file_path=file,
-                    object_prefix="chatbot_25_0528/muai-models/cost_ident/pdf_file",
-                )
-            elif file_extension in [".doc", ".docx", ".rtf"]:
-                res = up_local_file(
-                    local_file_path=file,
-                    object_prefix="chatbot_25_0528/muai-models/cost_ident/doc_file",
-                )
-            elif file_extension in [".xls", ".xlsx"]:
-                res = up_local_file(
-                    local_file_path=file,
-                    object_prefix="chatbot_25_0528/muai-models/cost_ident/excel_file",
-                )
-            elif file_extension in [".jpg", ".jpeg", ".png", ".bmp"]:
-                res = up_local_file(
-                    local_file_path=file,
-                    object_prefix="chatbot_25_0528/muai-models/cost_ident/image_file",
-                )
-            else:
-                res = up_local_file(
-                    local_file_path=file,
-                    object_prefix="chatbot_25_0528/muai-models/cost_ident/other_file",
-                )
-            logger.info(f"上传文件 {file} 成功，OSS对象键: {res}")
-        logger.info(f"所有文件上传完成，共上传 {len(self.uploaded_files)} 个文件")
+        # 上传文件到OSS与文件解析互不依赖，在后台线程中进行，不阻塞界面和解析
+        self._upload_files_to_oss(self.uploaded_files)
 
         if self._has_document_files(self.uploaded_files):
             # 更新状态提示
@@ -672,6 +693,90 @@ class UploadController(QObject):
         else:
             self._start_direct_analysis()
 
+    def _upload_files_to_oss(self, files: List[str]) -> None:
+        """在后台线程池中上传文件到OSS
+
+        Args:
+            files: 要上传的文件路径列表
+        """
+        if not files:
+            return
+        logger.info("开始上传文件到OSS")
+        if self._upload_executor is None:
+            self._upload_executor = ThreadPoolExecutor(
+                max_workers=_UPLOAD_WORKERS, thread_name_prefix="oss_upload"
+            )
+        with self._upload_lock:
+            for file in files:
+                self._uploading[file] = self._uploading.get(file, 0) + 1
+        futures = {
+            self._upload_executor.submit(_upload_file_to_oss, file): file for file in files
+        }
+
+        # 本批上传全部结束后汇总结果，回调在上传线程中执行，界面线程无需等待
+        remaining = [len(futures)]
+        failed: List[str] = []
+        batch_lock = threading.Lock()
+
+        def on_done(future: Future) -> None:
+            file = futures[future]
+            # 关闭窗口时尚未开始的上传会被取消
+            error = "已取消" if future.cancelled() else future.exception()
+            with batch_lock:
+                if error is not None:
+                    failed.append(f"{os.path.basename(file)}: {error}")
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            self._release_uploaded_file(file)
+            if finished:
+                self._report_upload_result(len(futures), failed)
+
+        for future in futures:
+            future.add_done_callback(on_done)
+
+    def _release_uploaded_file(self, file: str) -> None:
+        """上传结束后释放临时文件，清理时因仍在上传而暂缓的文件在此删除
+
+        Args:
+            file: 临时文件路径
+        """
+        with self._upload_lock:
+            count = self._uploading.get(file, 0) - 1
+            if count > 0:
+                self._uploading[file] = count
+                return
+            self._uploading.pop(file, None)
+            if file not in self._delete_after_upload:
+                return
+            self._delete_after_upload.discard(file)
+        try:
+            os.remove(file)
+        except OSError as e:
+            logger.error(f"删除已上传的临时文件失败 {file}: {str(e)}")
+
+    def _report_upload_result(self, total: int, failed: List[str]) -> None:
+        """记录一批上传的结果，有失败时通知界面
+
+        Args:
+            total: 本批文件数
+            failed: 上传失败的文件及原因
+        """
+        if failed:
+            error_msg = f"{len(failed)}/{total} 个文件上传OSS失败: " + "; ".join(failed)
+            error_logger.error(error_msg)
+            # 已关闭的控制器不再通知界面
+            if self._upload_executor is not None:
+                self.upload_failed.emit(error_msg)
+        else:
+            logger.info(f"所有文件上传完成，共上传 {total} 个文件")
+
+    def shutdown(self) -> None:
+        """关闭后台上传线程池，取消尚未开始的上传，不等待正在进行的上传"""
+        executor = self._upload_executor
+        self._upload_executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def _start_direct_analysis(self):
         """开始直接分析（原有流程）"""
         # 转换映射格式：将完整路径映射转换为文件名（无扩展名）映射
@@ -978,8 +1083,17 @@ class UploadController(QObject):
         """清理临时文件目录"""
         if hasattr(self, "temp_dir") and self.temp_dir.exists():
             try:
-                shutil.rmtree(str(self.temp_dir))
-                # 重新创建临时目录
+                # 仍在上传的文件不能立即删除，由上传完成的回调删除，界面线程无需等待
+                with self._upload_lock:
+                    uploading = set(self._uploading)
+                    self._delete_after_upload.update(uploading)
+                with os.scandir(self.temp_dir) as entries:
+                    for entry in list(entries):
+                        if entry.is_dir(follow_symlinks=False):
+                            shutil.rmtree(entry.path)
+                        elif entry.path not in uploading:
+                            os.remove(entry.path)
+                # 确保临时目录存在
                 self.temp_dir.mkdir(parents=True, exist_ok=True)
                 # 清空映射
                 self.file_path_mapping.clear()
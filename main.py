@@ -5,6 +5,7 @@
 
 import sys
 import os
+import multiprocessing
 
 # 确保当前目录在 Python 路径中
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -46,4 +47,6 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Excel 预处理使用进程池，打包为可执行文件时子进程需要此调用
+    multiprocessing.freeze_support()
     main()
@@ -3,14 +3,21 @@
 """
 
 import json
+import logging
 import os.path
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时使用标准库解析
+    orjson = None
+
 from PySide6.QtWidgets import (
     QMainWindow,
     QStatusBar,
     QMessageBox,
     QTabWidget,
 )
+from PySide6.QtCore import Qt
 
 from controllers.history_controller import HistoryController
 from data.data_manager import DataManager
@@ -24,6 +31,9 @@ from controllers.preview_controller import PreviewController
 from styles import StyleManager
 from utils.write_to_mineru_json import write_mineru_config
 
+logger = logging.getLogger(__name__)
+
+
 class MainWindow(QMainWindow):
     """应用程序主窗口，负责管理不同界面间的切换"""
 
@@ -98,9 +108,11 @@ class MainWindow(QMainWindow):
         """检查临时数据文件"""
         temp_json_path = os.path.join("temp", "temp_data.json")
         if os.path.exists(temp_json_path):
-            with open(temp_json_path, "r", encoding="utf-8") as f:
+            with open(temp_json_path, "rb") as f:
                 try:
-                    data = json.load(f)
+                    raw = f.read()
+                    # orjson.JSONDecodeError 是 json.JSONDecodeError 的子类
+                    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
                     if data:
                         source_files = [
                             item.get("源文件", "")
@@ -134,6 +146,10 @@ class MainWindow(QMainWindow):
         self.upload_controller.file_processed.connect(self._on_file_processed)
         self.upload_controller.processing_started.connect(self._on_processing_started)
         self.upload_controller.processing_finished.connect(self._on_processing_finished)
+        # 上传失败信号在后台线程中发出，排队到界面线程显示
+        self.upload_controller.upload_failed.connect(
+            self._on_upload_failed, Qt.QueuedConnection
+        )
 
         # 编辑界面信号
         self.edit_controller.data_saved.connect(
@@ -176,12 +192,19 @@ class MainWindow(QMainWindow):
         # 清空已处理的数据列表，为下一次处理做准备
         self.processed_files_data.clear()
 
+    def _on_upload_failed(self, error_msg):
+        """处理后台上传OSS失败事件"""
+        self.status_bar.showMessage("部分文件上传失败")
+        QMessageBox.warning(self, "上传失败", error_msg)
+
     def _on_file_processed(self):
         """提取数据完成，传递数据给编辑界面"""
         self.status_bar.showMessage("文件处理完成")
         data = self.data_manager.current_data
-        print("处理完成的文件:", data)
         filename = self.data_manager.file_name
+        # 只记录条数，避免每次都把整份数据格式化输出
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("处理完成的文件: %s, 共%d条数据", filename, len(data) if data else 0)
         self.edit_controller.update_filename(filename)
         # 直接保存原始数据，不修改结构
         if isinstance(data, list):
@@ -189,13 +212,14 @@ class MainWindow(QMainWindow):
         elif isinstance(data, dict):
             self.processed_files_data.append(data)
         else:
-            print(f"未知的数据格式: {type(data)}")
+            logger.debug("未知的数据格式: %s", type(data))
 
     def _on_submit_final(self):
         """处理最终提交事件"""
         self.status_bar.showMessage("准备上传数据")
         data = self.data_manager.current_data
-        print("最终提交的数据:", data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("最终提交的数据: 共%d条", len(data) if data else 0)
         self.preview_controller.set_data()
         self.tab_widget.setCurrentWidget(self.preview_view)
 
@@ -238,6 +262,7 @@ class MainWindow(QMainWindow):
             QMessageBox.No,
         )
         if reply == QMessageBox.Yes:
+            self.upload_controller.shutdown()
             event.accept()
         else:
             event.ignore()
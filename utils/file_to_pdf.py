@@ -4,19 +4,173 @@
 """
 import os
 import logging
+import stat
+from typing import Optional
+
 import pypandoc
 
 from docx2pdf import convert as docx2pdf_convert
 
+try:
+    import pythoncom
+    import win32com.client
+except ImportError:  # 非 Windows 平台没有 pywin32，使用 docx2pdf 逐个转换
+    pythoncom = None
+
 # 设置日志
 logger = logging.getLogger(__name__)
 
-def docx_to_pdf(input_path: str, output_path: str) -> str:
+# Word 另存为 PDF 的文件格式代码
+_WD_FORMAT_PDF = 17
+
+
+class WordPdfSession:
+    """复用同一个 Word 进程将多个文档转换为PDF
+
+    docx2pdf 每转换一个文件都会启动并退出一次 Word，批量转换时启动开销占大部分耗时。
+    会话在首次转换时启动一个独立的 Word 进程，之后的文件都交给它处理，
+    Word 崩溃或失去响应时自动重启一次。必须在同一线程中创建、使用和关闭。
+    """
+
+    def __init__(self):
+        self._word = None
+        self._com_initialized = False
+
+    @staticmethod
+    def available() -> bool:
+        """当前平台是否可以通过 COM 调用 Word"""
+        return pythoncom is not None
+
+    def _start(self) -> None:
+        """启动 Word 进程"""
+        if not self._com_initialized:
+            pythoncom.CoInitialize()
+            self._com_initialized = True
+        # DispatchEx 总是启动新的进程，不会占用用户已打开的 Word
+        self._word = win32com.client.DispatchEx("Word.Application")
+        self._word.Visible = False
+        self._word.DisplayAlerts = 0
+
+    def _quit(self) -> None:
+        """退出 Word 进程，忽略已崩溃进程的错误"""
+        if self._word is not None:
+            try:
+                self._word.Quit()
+            except Exception:
+                pass
+            self._word = None
+
+    def convert(self, input_path: str, output_path: str) -> str:
+        """将文档转换为PDF
+
+        Args:
+            input_path: 输入文档路径
+            output_path: 输出PDF文件路径
+
+        Returns:
+            生成的PDF文件路径
+        """
+        input_path = os.path.abspath(input_path)
+        output_path = os.path.abspath(output_path)
+        for attempt in range(2):
+            if self._word is None:
+                self._start()
+            try:
+                # RTF 等非 docx 文件打开时不弹出格式转换确认框，避免阻塞隐藏的 Word 进程
+                doc = self._word.Documents.Open(
+                    input_path,
+                    ConfirmConversions=False,
+                    ReadOnly=True,
+                    AddToRecentFiles=False,
+                )
+                try:
+                    doc.SaveAs(output_path, FileFormat=_WD_FORMAT_PDF)
+                finally:
+                    doc.Close(0)
+                return output_path
+            except pythoncom.com_error as e:
+                # Word 进程异常时重启后重试一次
+                logger.warning(f"Word转换出错，重启Word后重试: {e}")
+                self._quit()
+                if attempt:
+                    raise
+        return output_path
+
+    def close(self) -> None:
+        """退出 Word 进程并释放 COM"""
+        self._quit()
+        if self._com_initialized:
+            pythoncom.CoUninitialize()
+            self._com_initialized = False
+
+    def __enter__(self) -> "WordPdfSession":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def _input_size(input_path: str, label: str) -> int:
+    """检查输入文件并返回其大小，只调用一次 stat
+
+    Args:
+        input_path: 输入文件路径
+        label: 文档类型名称，用于错误信息
+
+    Returns:
+        文件大小（字节）
+
+    Raises:
+        FileNotFoundError: 输入文件不存在
+        ValueError: 路径不是文件
+    """
+    try:
+        st = os.stat(input_path)
+    except OSError:
+        raise FileNotFoundError(f"{label}文档不存在: {input_path}")
+    if not stat.S_ISREG(st.st_mode):
+        raise ValueError(f"路径不是文件: {input_path}")
+    return st.st_size
+
+
+def _file_size(path: str) -> Optional[int]:
+    """返回文件大小，文件不存在时返回 None"""
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
+
+
+def _remove_if_empty(path: str) -> None:
+    """删除转换失败时留下的空文件"""
+    if _file_size(path) == 0:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _verify_pdf(output_path: str) -> None:
+    """检查PDF是否已生成且不为空
+
+    Raises:
+        RuntimeError: PDF未生成或为空
+    """
+    size = _file_size(output_path)
+    if size is None:
+        raise RuntimeError("PDF文件未生成")
+    elif size == 0:
+        raise RuntimeError("生成的PDF文件为空")
+
+def docx_to_pdf(
+        input_path: str, output_path: str, session: Optional[WordPdfSession] = None
+) -> str:
     """Word文档转PDF
 
     Args:
         input_path: 输入Word文档路径
         output_path: 输出PDF文件路径
+        session: 复用的 Word 会话，为空时由 docx2pdf 单独启动 Word
 
     Returns:
         生成的PDF文件路径
@@ -34,22 +188,15 @@ def docx_to_pdf(input_path: str, output_path: str) -> str:
         if not output_path or not isinstance(output_path, str):
             raise ValueError("输出文件路径无效")
 
-        # 检查输入文件
-        if not os.path.exists(input_path):
-            raise FileNotFoundError(f"Word文档不存在: {input_path}")
-
-        if not os.path.isfile(input_path):
-            raise ValueError(f"路径不是文件: {input_path}")
-
-        # 检查文件大小
-        file_size = os.path.getsize(input_path)
+        # 检查输入文件和文件大小
+        file_size = _input_size(input_path, "Word")
         if file_size == 0:
             raise ValueError("Word文档为空")
         elif file_size > 50 * 1024 * 1024:  # 50MB限制
             raise ValueError(f"Word文档太大 ({file_size / 1024 / 1024:.1f}MB)，超过50MB限制")
 
         # 检查依赖
-        if docx2pdf_convert is None:
+        if session is None and docx2pdf_convert is None:
             raise RuntimeError("docx2pdf库未正确安装，无法进行Word转PDF")
 
         # 创建输出目录
@@ -62,22 +209,18 @@ def docx_to_pdf(input_path: str, output_path: str) -> str:
 
         # 执行转换
         try:
-            docx2pdf_convert(input_path, output_path)
+            if session is not None:
+                session.convert(input_path, output_path)
+            else:
+                docx2pdf_convert(input_path, output_path)
 
             # 验证输出文件
-            if not os.path.exists(output_path):
-                raise RuntimeError("PDF文件未生成")
-            elif os.path.getsize(output_path) == 0:
-                raise RuntimeError("生成的PDF文件为空")
+            _verify_pdf(output_path)
             return output_path
 
         except Exception as convert_error:
             # 清理可能生成的空文件
-            if os.path.exists(output_path) and os.path.getsize(output_path) == 0:
-                try:
-                    os.remove(output_path)
-                except:
-                    pass
+            _remove_if_empty(output_path)
             raise convert_error
 
     except Exception as e:
@@ -85,12 +228,16 @@ def docx_to_pdf(input_path: str, output_path: str) -> str:
         logger.error(error_msg)
         raise RuntimeError(error_msg) from e
 
-def rtf_to_pdf(input_path: str, output_path: str) -> str:
+def rtf_to_pdf(
+        input_path: str, output_path: str, session: Optional[WordPdfSession] = None
+) -> str:
     """RTF文档转PDF
     
     Args:
         input_path: 输入RTF文档路径
         output_path: 输出PDF文件路径
+        session: 复用的 Word 会话，由 Word 直接打开 RTF；为空时先用 pandoc
+            转为 DOCX，再由 docx2pdf 单独启动 Word
         
     Returns:
         生成的PDF文件路径
@@ -109,24 +256,17 @@ def rtf_to_pdf(input_path: str, output_path: str) -> str:
         if not output_path or not isinstance(output_path, str):
             raise ValueError("输出文件路径无效")
 
-        # 检查输入文件
-        if not os.path.exists(input_path):
-            raise FileNotFoundError(f"RTF文档不存在: {input_path}")
-
-        if not os.path.isfile(input_path):
-            raise ValueError(f"路径不是文件: {input_path}")
-
-        # 检查文件大小
-        file_size = os.path.getsize(input_path)
+        # 检查输入文件和文件大小
+        file_size = _input_size(input_path, "RTF")
         if file_size == 0:
             raise ValueError("RTF文档为空")
         elif file_size > 50 * 1024 * 1024:  # 50MB限制
             raise ValueError(f"RTF文档太大 ({file_size / 1024 / 1024:.1f}MB)，超过50MB限制")
 
         # 检查依赖
-        if pypandoc is None:
+        if session is None and pypandoc is None:
             raise RuntimeError("pypandoc库未正确安装，无法进行RTF转换")
-        if docx2pdf_convert is None:
+        if session is None and docx2pdf_convert is None:
             raise RuntimeError("docx2pdf库未正确安装，无法进行最终PDF转换")
 
         # 创建输出目录
@@ -137,6 +277,12 @@ def rtf_to_pdf(input_path: str, output_path: str) -> str:
             except OSError as e:
                 raise RuntimeError(f"创建输出目录失败: {e}")
 
+        if session is not None:
+            # Word 可以直接打开 RTF，复用会话时无需再启动 pandoc 转为临时 DOCX
+            session.convert(input_path, output_path)
+            _verify_pdf(output_path)
+            return output_path
+
         # 生成临时docx文件路径
         temp_docx_file = input_path.replace('.rtf', '_temp.docx')
 
@@ -151,19 +297,17 @@ def rtf_to_pdf(input_path: str, output_path: str) -> str:
             )
 
             # 验证临时文件
-            if not os.path.exists(temp_docx_file):
+            temp_size = _file_size(temp_docx_file)
+            if temp_size is None:
                 raise RuntimeError("RTF转DOCX失败，临时文件未生成")
-            elif os.path.getsize(temp_docx_file) == 0:
+            elif temp_size == 0:
                 raise RuntimeError("RTF转DOCX失败，临时文件为空")
 
             # 第二步：DOCX转PDF
             docx2pdf_convert(temp_docx_file, output_path)
 
             # 验证输出文件
-            if not os.path.exists(output_path):
-                raise RuntimeError("PDF文件未生成")
-            elif os.path.getsize(output_path) == 0:
-                raise RuntimeError("生成的PDF文件为空")
+            _verify_pdf(output_path)
             return output_path
         finally:
             # 清理临时文件
@@ -174,14 +318,10 @@ def rtf_to_pdf(input_path: str, output_path: str) -> str:
         error_msg = f"RTF转PDF失败 {input_path}: {str(e)}"
         logger.error(error_msg)
 
-        # 清理可能生成的文件
-        for cleanup_file in [temp_docx_file, output_path]:
-            if cleanup_file and os.path.exists(cleanup_file):
-                try:
-                    if os.path.getsize(cleanup_file) == 0:  # 只删除空文件
-                        os.remove(cleanup_file)
-                except:
-                    pass
+        # 清理可能生成的文件，只删除空文件
+        for cleanup_file in (temp_docx_file, output_path):
+            if cleanup_file:
+                _remove_if_empty(cleanup_file)
 
         raise RuntimeError(error_msg) from e
 
@@ -0,0 +1,146 @@
+"""
+大模型调用结果缓存模块
+以输入图片内容、模型名称和提示词计算缓存键，重复处理相同的表格时直接复用结果
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Iterable, Optional
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时使用标准库序列化
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# 缓存目录，每次处理前都会清空输出目录，因此缓存单独存放
+CACHE_DIR = os.path.join("cache", "llm")
+# 缓存文件的最长保留时间（秒）和缓存目录的总大小上限（字节）
+CACHE_MAX_AGE = 30 * 24 * 3600
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+def data_digest(data: bytes) -> str:
+    """计算二进制内容的摘要
+
+    Args:
+        data: 已读取的文件内容
+
+    Returns:
+        十六进制摘要字符串
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_digest(file_path: str) -> str:
+    """计算文件内容的摘要
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        十六进制摘要字符串
+    """
+    with open(file_path, "rb") as f:
+        return data_digest(f.read())
+
+
+def make_key(parts: Iterable[str]) -> str:
+    """由多个字符串片段计算缓存键
+
+    Args:
+        parts: 参与计算的字符串，如图片摘要、模型名称、提示词
+
+    Returns:
+        缓存键
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def load(namespace: str, key: str) -> Optional[Any]:
+    """读取缓存
+
+    Args:
+        namespace: 缓存分类，如 layout、markdown
+        key: 缓存键
+
+    Returns:
+        缓存的值，不存在或读取失败时返回 None
+    """
+    cache_path = os.path.join(CACHE_DIR, namespace, f"{key}.json")
+    try:
+        with open(cache_path, "rb") as f:
+            raw = f.read()
+        # orjson.JSONDecodeError 是 ValueError 的子类
+        value = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        # 更新修改时间，清理缓存时最近使用过的文件最后删除
+        os.utime(cache_path)
+        return value
+    except (OSError, ValueError):
+        return None
+
+
+def save(namespace: str, key: str, value: Any) -> None:
+    """写入缓存，失败时忽略
+
+    Args:
+        namespace: 缓存分类
+        key: 缓存键
+        value: 可 JSON 序列化的值
+    """
+    cache_dir = os.path.join(CACHE_DIR, namespace)
+    cache_path = os.path.join(cache_dir, f"{key}.json")
+    # 先写临时文件再替换，避免并发读取到不完整的内容；
+    # 多个线程可能同时写入同一个键，临时文件名各不相同
+    tmp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        if orjson is not None:
+            payload = orjson.dumps(value)
+        else:
+            payload = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("写入大模型缓存失败: %s", e)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def prune() -> None:
+    """清理缓存：删除超过保留时间的文件，总大小超过上限时从最久未使用的文件开始删除"""
+    files = []
+    try:
+        with os.scandir(CACHE_DIR) as namespaces:
+            for namespace in namespaces:
+                if not namespace.is_dir():
+                    continue
+                with os.scandir(namespace.path) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            st = entry.stat()
+                            files.append((st.st_mtime, st.st_size, entry.path))
+    except OSError:
+        return
+
+    expire_before = time.time() - CACHE_MAX_AGE
+    total = sum(size for _, size, _ in files)
+    for mtime, size, path in sorted(files):
+        if mtime >= expire_before and total <= CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
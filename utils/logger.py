@@ -6,13 +6,17 @@
 3. 自动创建日志目录
 4. 防止重复添加处理器
 5. 全局异常捕获和记录
+6. 后台线程写入日志文件，记录日志的线程无需等待磁盘写入
 """
 
+import atexit
 import logging
 import os
+import queue
 import sys
 import traceback
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
 class LoggerManager:
@@ -20,6 +24,8 @@ class LoggerManager:
 
     # 存储已创建的 logger 实例，避免重复创建
     _loggers = {}
+    # 每个日志文件对应的后台写入监听器
+    _listeners = {}
     # 日志目录
     LOG_DIR = "./log"
 
@@ -85,8 +91,14 @@ class LoggerManager:
             )
             file_handler.setFormatter(formatter)
 
+            # 记录日志时只放入队列，由后台线程写入文件
+            log_queue = queue.Queue(-1)
+            listener = QueueListener(log_queue, file_handler)
+            listener.start()
+            cls._listeners[logger_key] = listener
+
             # 添加处理器
-            logger.addHandler(file_handler)
+            logger.addHandler(QueueHandler(log_queue))
 
         # 缓存 logger
         cls._loggers[logger_key] = logger
@@ -144,15 +156,34 @@ class LoggerManager:
 
         logger.addHandler(console_handler)
 
+    @classmethod
+    def flush(cls) -> None:
+        """等待队列中的日志全部写入文件"""
+        for listener in cls._listeners.values():
+            # stop() 会处理完队列中剩余的记录后再返回
+            listener.stop()
+            for handler in listener.handlers:
+                handler.flush()
+            listener.start()
+
     @classmethod
     def cleanup(cls) -> None:
         """清理所有日志记录器（用于程序退出时）"""
+        for listener in cls._listeners.values():
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+        cls._listeners.clear()
         for logger in cls._loggers.values():
             for handler in logger.handlers[:]:
                 handler.close()
                 logger.removeHandler(handler)
         cls._loggers.clear()
 
+
+# 程序退出前写完队列中的日志
+atexit.register(LoggerManager.cleanup)
+
 # ==================== 预定义的日志记录器 ====================
 
 
@@ -342,6 +373,9 @@ def upload_all_logs() -> None:
     from utils.upload_file_to_oss import up_local_file
     import glob
 
+    # 上传前确保后台线程已将日志写入文件
+    LoggerManager.flush()
+
     # 定义日志文件名模式
     log_patterns = [
         "./log/*-上传文件.log",  # upload + file_conversion
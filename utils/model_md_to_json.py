@@ -2,10 +2,16 @@
 Markdown文件信息提取模块
 使用AI模型从Markdown文件中提取费用明细信息
 """
+import json
 import os
-from typing import Optional
+from typing import Any, Optional
 from random import choice
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时使用标准库解析
+    orjson = None
+
 from openai import OpenAI
 from dotenv import load_dotenv
 
@@ -18,7 +24,7 @@ DASH_KEYS = [
     os.getenv("DASHSCOPE_API_KEY3"),
 ]
 
-def extract_info_from_md(md_file_path: str, content: str = "") -> str:
+def extract_info_from_md(md_file_path: str, content: str = "") -> Any:
     """从单个markdown文件中提取信息
     
     Args:
@@ -26,23 +32,25 @@ def extract_info_from_md(md_file_path: str, content: str = "") -> str:
         content: 可选的Markdown内容字符串，若提供则不读取文件
         
     Returns:
-        提取的JSON字符串结果
+        解析后的提取结果，通常为包含"费用明细"的字典
         
     Raises:
         FileNotFoundError: 当文件不存在时
-        Exception: 当API调用失败时
+        Exception: 当API调用失败或返回内容不是合法JSON时
     """
 
     if not content:
         content = _read_markdown_file(md_file_path)
         if not content:
-            return "{}"
+            return {}
 
     try:
         client = _create_openai_client()
         response = _call_extraction_api(client, content)
-        print(f'API调用成功，响应: {response.choices[0].message.content}')
-        return response.choices[0].message.content
+        result = response.choices[0].message.content
+        print(f'API调用成功，响应: {result}')
+        # 只在这里解析一次，调用方直接使用返回的对象
+        return orjson.loads(result) if orjson is not None else json.loads(result)
 
     except Exception as e:
         print(f"API调用失败: {e}")
@@ -1,24 +1,51 @@
+import base64
 import json
+import logging
 import os
+import re
 import time
 
-from typing import List
+from typing import List, Union
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时使用标准库解析
+    orjson = None
 from config.config import LAYOUT_IDENTIFY_PROMPT, HEADER_ROW_DETECTION_PROMPT, CORRECTION_PROMPT, \
-    EXCEL_TABLE_EXTRACTION_PROMPT
+    EXCEL_TABLE_EXTRACTION_PROMPT, EXCEL_MULTI_SHEET_EXTRACTION_PROMPT, EXCEL_TABLE_JSON_EXTRACTION_PROMPT
 from dashscope import MultiModalConversation, Generation
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# Excel 布局检测
-def detect_excel_layout(file_paths: List[str]) -> dict:
-    print('detect_excel_layout', file_paths[0])
-    content = []
-    for file_path in file_paths:
-        file_path = f"file://{Path(file_path).as_posix()}"
-        content.append({"image": file_path})
+logger = logging.getLogger(__name__)
+
+# 识别表格图片使用的多模态模型
+VL_MODEL = "qwen3-vl-plus"
+# 批量提取时单次请求最多携带的图片数量
+MAX_IMAGES_PER_EXTRACTION = 20
+# 批量提取结果中每个工作表的起始标记
+_SHEET_MARKER_RE = re.compile(r"^<<<SHEET (\d+)>>>[ \t]*$", re.MULTILINE)
+# 模型回复中可能包裹 JSON 的代码块标记
+_CODE_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+# 解析模型回复中的JSON，去除可能包裹的代码块标记
+def _loads_json(text: str):
+    text = _CODE_FENCE_RE.sub("", text)
+    # orjson.JSONDecodeError 是 json.JSONDecodeError 的子类
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+# 图片消息内容：已读入内存的PNG以base64内联发送，无需再次读取和上传文件
+def _image_content(image: Union[str, bytes]) -> dict:
+    if isinstance(image, bytes):
+        return {"image": f"data:image/png;base64,{base64.b64encode(image).decode('ascii')}"}
+    return {"image": f"file://{Path(image).as_posix()}"}
+
+# Excel 布局检测，images 为图片路径或PNG内容，返回 {"index_1": 布局类型, ...}，解析失败时返回空字典
+def detect_excel_layout(images: List[Union[str, bytes]]) -> dict:
+    logger.debug("detect_excel_layout %d", len(images))
+    content = [_image_content(image) for image in images]
     content.append({"text": LAYOUT_IDENTIFY_PROMPT})
     messages = [
         {
@@ -28,15 +55,21 @@ def detect_excel_layout(file_paths: List[str]) -> dict:
     ]
     response = MultiModalConversation.call(
         api_key=os.getenv("DASHSCOPE_API_KEY1"),
-        model="qwen3-vl-plus",
+        model=VL_MODEL,
         messages=messages,
     )
-    return response.get("output").choices[0].get("message").get("content")[0].get("text")
+    text = response.get("output").choices[0].get("message").get("content")[0].get("text")
+    try:
+        parsed = _loads_json(text)
+    except json.JSONDecodeError as e:
+        logger.debug("解析布局检测结果失败: %s, 使用默认布局", e)
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
 
 # 判断读取前20行数据的表头索引
 def determine_header_index(rows):
     rows_str = json.dumps(rows, ensure_ascii=False)
-    print(rows_str)
+    logger.debug("%s", rows_str)
     messages = [
         {"role": "system", "content": HEADER_ROW_DETECTION_PROMPT},
         {"role": "user", "content": rows_str},
@@ -67,7 +100,7 @@ def correct_excel_table(file_paths: List[str], markdown_content: str) -> str:
     ]
     response = MultiModalConversation.call(
         api_key=os.getenv("DASHSCOPE_API_KEY2"),
-        model="qwen3-vl-plus",
+        model=VL_MODEL,
         messages=messages,
         stream=True,
         enable_thinking=enable_thinking,
@@ -119,10 +152,117 @@ def extract_excel_data_to_markdown(file_paths: List[str]) -> str:
     ]
     response = MultiModalConversation.call(
         api_key=os.getenv("DASHSCOPE_API_KEY2"),
-        model="qwen3-vl-plus",
+        model=VL_MODEL,
         messages=messages,
     )
     return response.get("output").choices[0].get("message").get("content")[0].get("text")
 
+# 直接从图片中提取费用明细，输出JSON
+def extract_excel_data_to_json(file_paths: List[str]) -> dict:
+    """
+    由多模态模型直接从表格图片中提取费用明细，省去先输出markdown再转换的模型调用。
+
+    参数：
+        file_paths: 同一工作表按顺序排列的图片路径列表
+
+    返回：
+        解析后的字典，格式为 {"费用明细": [...]}，解析失败时返回空字典
+    """
+    content = []
+    for file_path in file_paths:
+        file_path = f"file://{Path(file_path).as_posix()}"
+        content.append({"image": file_path})
+    content.append({"text": EXCEL_TABLE_JSON_EXTRACTION_PROMPT})
+    messages = [
+        {
+            "role": "user",
+            "content": content
+        }
+    ]
+    response = MultiModalConversation.call(
+        api_key=os.getenv("DASHSCOPE_API_KEY2"),
+        model=VL_MODEL,
+        messages=messages,
+    )
+    text = response.get("output").choices[0].get("message").get("content")[0].get("text")
+    try:
+        parsed = _loads_json(text)
+    except json.JSONDecodeError as e:
+        logger.debug("解析提取结果JSON失败: %s", e)
+        return {}
+    if isinstance(parsed, list):
+        parsed = {"费用明细": parsed}
+    return parsed if isinstance(parsed, dict) else {}
+
+# 多个工作表合并为一次请求提取数据，按工作表返回markdown
+def extract_excel_data_to_markdown_batch(sheet_images: List[List[str]]) -> List[str]:
+    """
+    将多个工作表的图片合并到尽量少的请求中提取数据。
+
+    参数：
+        sheet_images: 每个工作表按顺序排列的图片路径列表
+
+    返回：
+        与输入顺序一致的markdown内容列表
+    """
+    results = [""] * len(sheet_images)
+
+    # 按图片数量分组，单个工作表的图片不会被拆到不同请求中
+    batches = []
+    current, current_count = [], 0
+    for idx, images in enumerate(sheet_images):
+        if current and current_count + len(images) > MAX_IMAGES_PER_EXTRACTION:
+            batches.append(current)
+            current, current_count = [], 0
+        current.append(idx)
+        current_count += len(images)
+    if current:
+        batches.append(current)
+
+    for batch in batches:
+        if len(batch) == 1:
+            results[batch[0]] = extract_excel_data_to_markdown(sheet_images[batch[0]])
+            continue
+
+        content = []
+        for number, idx in enumerate(batch, 1):
+            content.append({"text": f"工作表 {number}"})
+            for file_path in sheet_images[idx]:
+                content.append({"image": f"file://{Path(file_path).as_posix()}"})
+        content.append({"text": EXCEL_TABLE_EXTRACTION_PROMPT})
+        content.append({"text": EXCEL_MULTI_SHEET_EXTRACTION_PROMPT.format(count=len(batch))})
+        messages = [
+            {
+                "role": "user",
+                "content": content
+            }
+        ]
+        response = MultiModalConversation.call(
+            api_key=os.getenv("DASHSCOPE_API_KEY2"),
+            model=VL_MODEL,
+            messages=messages,
+        )
+        text = response.get("output").choices[0].get("message").get("content")[0].get("text")
+
+        # 按标记拆分回各工作表，缺失的工作表单独重新提取
+        parts = _split_sheet_markdown(text)
+        for number, idx in enumerate(batch, 1):
+            markdown = parts.get(number, "")
+            if not markdown:
+                logger.debug("批量提取结果中缺少工作表 %d，单独重新提取", number)
+                markdown = extract_excel_data_to_markdown(sheet_images[idx])
+            results[idx] = markdown
+
+    return results
+
+# 按工作表标记拆分批量提取的结果
+def _split_sheet_markdown(text: str) -> dict:
+    matches = list(_SHEET_MARKER_RE.finditer(text))
+    parts = {}
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        parts[int(match.group(1))] = text[match.end():end].strip()
+    return parts
+
 if __name__ == "__main__":
     print("Excel LLM Utils Test")
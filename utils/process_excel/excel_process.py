@@ -1,16 +1,70 @@
 import excel2img
 import xlwings as xw
 
+from config.config import EXCEL_IMAGE_RENDERER
+
+# 判断工作表的使用范围内是否有内容
+def _has_used_data(used_range):
+    """
+    与 `if used_range.value:` 的判断结果一致，但不会把整个使用范围读入内存：
+    多个单元格的范围总是返回非空列表，只有单个单元格时才需要读取其值。
+    """
+    return used_range.count > 1 or bool(used_range.value)
+
+# 启动一个可在多次调用间共享的后台Excel实例
+def new_excel_app():
+    """
+    启动一个不显示界面、不弹出提示的Excel实例，由调用方负责 quit()。
+
+    返回：
+        xw.App
+    """
+    app = xw.App(visible=False, add_book=False)
+    app.display_alerts = False
+    app.screen_updating = False
+    return app
+
+# 获取本次调用使用的Excel实例
+def acquire_excel_app(app=None, kill=False):
+    """
+    传入共享实例时直接使用，否则临时启动一个新实例。
+
+    参数：
+        app (xw.App): 共享的Excel实例，可为空。
+        kill (bool): 临时实例结束时是否强制结束进程。
+
+    返回：
+        (Excel实例, 释放函数)。临时实例在释放时退出；共享实例在释放时
+        只关闭本次调用期间打开的工作簿，实例本身继续保留。
+    """
+    if app is None:
+        app = xw.App(visible=False)
+        return app, (app.kill if kill else app.quit)
+
+    opened_books = {book.name for book in app.books}
+
+    def release():
+        for book in list(app.books):
+            if book.name not in opened_books:
+                try:
+                    book.close()
+                except Exception:
+                    pass
+
+    return app, release
+
 # 使用xlwings将.xls文件转换为.xlsx格式
-def convert_xls_to_xlsx(input_file, output_file):
-    app = xw.App(visible=False)
-    wb = app.books.open(input_file)
-    wb.save(output_file)
-    wb.close()
-    app.kill()
+def convert_xls_to_xlsx(input_file, output_file, app=None):
+    app, release_app = acquire_excel_app(app, kill=True)
+    try:
+        wb = app.books.open(input_file)
+        wb.save(output_file)
+        wb.close()
+    finally:
+        release_app()
 
 # 将Excel文件拆分为多个工作表
-def split_excel_sheets(input_file, output_dir):
+def split_excel_sheets(input_file, output_dir, app=None):
     """
     将一个Excel文件拆分为多个工作表，并将每个工作表保存为一个新的Excel文件。
     保留原始格式（字体、颜色、边框、列宽等）。
@@ -18,9 +72,11 @@ def split_excel_sheets(input_file, output_dir):
     参数：
         input_file (str): 输入Excel文件的路径。
         output_dir (str): 保存拆分工作表的目录。
+        app (xw.App): 共享的Excel实例，为空时临时启动一个。
 
     返回：
-        None
+        dict: {工作表名称: (保存的文件路径, 有数据的行数)}，按工作表顺序排列，
+        只包含保存成功的工作表。行数为0表示该工作表没有任何数据。
     """
     import os
 
@@ -28,7 +84,8 @@ def split_excel_sheets(input_file, output_dir):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    app = xw.App(visible=False)
+    output_files = {}
+    app, release_app = acquire_excel_app(app)
     try:
         # 加载工作簿
         wb = app.books.open(input_file)
@@ -44,20 +101,26 @@ def split_excel_sheets(input_file, output_dir):
 
             # 获取实际使用的范围
             used_range = sheet.used_range
-            if used_range.value:
+            # 拆分时已逐行扫描数据，顺便记录有数据的行数，调用方无需再打开文件判断是否为空
+            data_rows = 0
+            if _has_used_data(used_range):
                 # 查找真正有数据的最后一行和最后一列
                 last_row = 0
                 last_col = 0
+                used_last_col = used_range.last_cell.column
 
-                # 遍历used_range找到实际有数据的最后位置
+                # 逐行读取used_range找到实际有数据的最后位置，每次只读取一行
                 for row_idx in range(1, used_range.last_cell.row + 1):
-                    for col_idx in range(1, used_range.last_cell.column + 1):
-                        cell_value = sheet.range((row_idx, col_idx)).value
+                    row_values = sheet.range(
+                        (row_idx, 1), (row_idx, used_last_col)
+                    ).options(ndim=1).value
+                    for col_idx, cell_value in enumerate(row_values, 1):
                         # 检查单元格是否有实际数据（非None且非空字符串）
                         if cell_value is not None and str(cell_value).strip() != "":
-                            last_row = max(last_row, row_idx)
+                            last_row = row_idx
                             last_col = max(last_col, col_idx)
 
+                data_rows = last_row
                 # 如果没找到数据，使用默认值
                 if last_row == 0 or last_col == 0:
                     last_row = used_range.last_cell.row
@@ -98,6 +161,7 @@ def split_excel_sheets(input_file, output_dir):
             try:
                 new_wb.save(output_file)
                 new_wb.close()
+                output_files[sheet_name] = (output_file, data_rows)
                 print(f"已将工作表 '{sheet_name}' 保存到 '{output_file}'（已保留格式）")
             except Exception as e:
                 print(f"保存工作表 '{sheet_name}' 时出错: {e}")
@@ -106,12 +170,32 @@ def split_excel_sheets(input_file, output_dir):
     except Exception as e:
         print(f"加载工作簿时出错: {e}")
     finally:
-        app.kill()
+        release_app()
+    return output_files
+
+# 将单个Excel文件导出为图片
+def export_excel_image(input_file, output_file):
+    """
+    按 EXCEL_IMAGE_RENDERER 配置选择 excel2img 或 Spire.XLS 将Excel导出为图片。
+
+    参数：
+        input_file (str): 输入Excel文件路径。
+        output_file (str): 输出图片路径。
+
+    返回：
+        None
+    """
+    if EXCEL_IMAGE_RENDERER == "spire":
+        from utils.process_excel.xlsx_to_png import render_sheet_to_png
+
+        render_sheet_to_png(input_file, output_file)
+    else:
+        excel2img.export_img(input_file, output_file)
 
 # 将Excel文件转换为图片
 def convert_excel_to_images(file_paths, output_dir):
     """
-    使用excel2img包将给定的Excel文件列表转换为图片。
+    将给定的Excel文件列表转换为图片，渲染方式由 EXCEL_IMAGE_RENDERER 决定。
 
     参数：
         file_paths (list): 包含Excel文件路径的列表。
@@ -122,6 +206,12 @@ def convert_excel_to_images(file_paths, output_dir):
     """
     import os
 
+    if EXCEL_IMAGE_RENDERER == "spire":
+        from utils.process_excel.xlsx_to_png import convert_excel_to_images_batch
+
+        convert_excel_to_images_batch(file_paths, output_dir)
+        return
+
     # 确保输出目录存在
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
@@ -141,18 +231,19 @@ def convert_excel_to_images(file_paths, output_dir):
                 print(f"转换 '{input_file}' 时出错: {e}")
 
 # 保留Excel文件格式，调整列宽
-def auto_adjust_excel_column_width(input_file, output_file):
+def auto_adjust_excel_column_width(input_file, output_file, app=None):
     """
     使用xlwings包将给定的Excel文件调整列宽，并保留原始格式（字体、颜色、边框等）。
 
     参数：
         input_file (str): 输入Excel文件路径。
         output_file (str): 输出Excel文件路径。
+        app (xw.App): 共享的Excel实例，为空时临时启动一个。
 
     返回：
         None
     """
-    app = xw.App(visible=False)
+    app, release_app = acquire_excel_app(app)
     try:
         # 打开工作簿
         wb = app.books.open(input_file)
@@ -162,7 +253,7 @@ def auto_adjust_excel_column_width(input_file, output_file):
             # 获取使用的范围
             used_range = sheet.used_range
 
-            if used_range.value:
+            if _has_used_data(used_range):
                 # 自动调整列宽
                 for col_idx in range(1, used_range.columns.count + 1):
                     col_letter = xw.utils.col_name(col_idx)
@@ -182,7 +273,7 @@ def auto_adjust_excel_column_width(input_file, output_file):
         print(f"调整Excel列宽时出错: {e}")
         raise
     finally:
-        app.quit()
+        release_app()
 
 if __name__ == "__main__":
     print("Excel处理工具模块已加载")
@@ -1,24 +1,26 @@
 import os
 
-import excel2img
 import xlwings as xw
 from dotenv import load_dotenv
 
+from utils.process_excel.excel_process import acquire_excel_app, export_excel_image
+
 load_dotenv()
 
 # 单个Excel文件进行列宽调整、添加边框，并转换为图片
-def format_excel_and_convert_to_image(file_path, output_image_path):
+def format_excel_and_convert_to_image(file_path, output_image_path, app=None):
     """
     给单个Excel文件调整列宽、添加全部框线，并转换为图片。
 
     参数：
         file_path (str): 输入Excel文件的路径。
         output_image_path (str): 输出图片的路径。
+        app (xw.App): 共享的Excel实例，为空时临时启动一个。
 
     返回：
         None
     """
-    app = xw.App(visible=False)
+    app, release_app = acquire_excel_app(app)
     try:
         # 加载工作簿
         wb = app.books.open(file_path)
@@ -45,7 +47,7 @@ def format_excel_and_convert_to_image(file_path, output_image_path):
         print(f"已格式化: {file_path}")
 
         # 转换为图片
-        excel2img.export_img(file_path, output_image_path)
+        export_excel_image(file_path, output_image_path)
         print(f"已转换为图片: {output_image_path}")
 
     except Exception as e:
@@ -57,7 +59,7 @@ def format_excel_and_convert_to_image(file_path, output_image_path):
         else:
             raise e  # 如果图片未生成，则重新抛出异常
     finally:
-        app.quit()
+        release_app()
 
 if __name__ == "__main__":
     print('测试 Excel 格式化和数据提取')
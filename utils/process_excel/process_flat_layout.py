@@ -1,19 +1,24 @@
+import logging
 import os
 import dashscope
 import xlwings as xw
 from dotenv import load_dotenv
 
+from utils.process_excel.excel_process import acquire_excel_app
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 dashscope.base_http_api_url = "https://dashscope.aliyuncs.com/api/v1"
 
 # 使用 xlwings 读取 Excel 文件的前 20 行数据
-def read_excel_first_20_rows(file_path):
+def read_excel_first_20_rows(file_path, app=None):
     """
     使用 xlwings 读取 Excel 文件的前 20 行数据。
     """
     data = []
-    app = xw.App(visible=False)
+    app, release_app = acquire_excel_app(app)
     try:
         wb = app.books.open(file_path)
         sheet = wb.sheets[0]
@@ -32,13 +37,13 @@ def read_excel_first_20_rows(file_path):
     except Exception as e:
         print(f"读取 Excel 文件时出错: {e}")
     finally:
-        app.quit()
+        release_app()
 
     return data
 
 # 按行切分Excel
 def split_excel_by_rows_with_header(
-        file_path, output_dir, header_index, rows_per_file=10
+        file_path, output_dir, header_index, rows_per_file=10, app=None
 ):
     """
     将Excel表格按行切分，每10行切分成一个新的Excel文件，且保留从第1行到表头索引行的所有数据。
@@ -49,15 +54,17 @@ def split_excel_by_rows_with_header(
         output_dir (str): 输出文件的目录。
         header_index (int): 表头索引行的行号。
         rows_per_file (int): 每个文件包含的行数，默认为10。
+        app (xw.App): 共享的Excel实例，为空时临时启动一个。
 
     返回：
-        None
+        list: 按起始行顺序保存的文件路径列表。
     """
     # 确保输出目录存在
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    app = xw.App(visible=False)
+    output_files = []
+    app, release_app = acquire_excel_app(app)
     try:
         # 加载工作簿
         wb = app.books.open(file_path)
@@ -120,69 +127,153 @@ def split_excel_by_rows_with_header(
             )
             new_wb.save(output_file)
             new_wb.close()
+            output_files.append(output_file)
             print(f"已保存: {output_file}（已保留格式）")
 
         wb.close()
     except Exception as e:
         print(f"切分Excel文件时出错: {e}")
     finally:
-        app.quit()
+        release_app()
+    return output_files
+
+# 将整张表格的图片按行裁剪为多张带表头的图片
+def crop_sheet_image_by_rows(
+        file_path, image_path, output_dir, header_index, rows_per_file=10, app=None
+):
+    """
+    按行高将已渲染的整表图片裁剪为多张图片，每张图片都拼接上第1行到表头索引行的区域，
+    效果与先按行切分Excel再逐个渲染相同，但只需渲染一次。
+
+    参数：
+        file_path (str): 已渲染为图片的Excel文件路径，用于读取行高。
+        image_path (str): 整张表格（已用区域）的图片路径。
+        output_dir (str): 输出图片的目录。
+        header_index (int): 表头索引行的行号。
+        rows_per_file (int): 每张图片包含的数据行数，默认为10。
+        app (xw.App): 共享的Excel实例，为空时临时启动一个。
+
+    返回：
+        按起始行号排列的图片路径列表
+    """
+    from itertools import accumulate
+    from PIL import Image
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    app, release_app = acquire_excel_app(app)
+    try:
+        wb = app.books.open(file_path)
+        sheet = wb.sheets[0]
+        sheet_name = sheet.name
+        used_range = sheet.used_range
+        first_row = used_range.row
+        last_row = used_range.last_cell.row
+        row_heights = [
+            sheet.range(f"{row_idx}:{row_idx}").row_height
+            for row_idx in range(first_row, last_row + 1)
+        ]
+        wb.close()
+    finally:
+        release_app()
+
+    # 图片对应已用区域，offsets[i] 为第 first_row + i 行顶部到区域顶部的距离（磅）
+    offsets = list(accumulate(row_heights, initial=0))
+    if not offsets[-1]:
+        raise ValueError(f"无法获取行高: {file_path}")
+
+    image_files = []
+    with Image.open(image_path) as source:
+        image = source.convert("RGB")
+        scale = image.height / offsets[-1]
+
+        def crop_rows(start_row, end_row):
+            top = round(offsets[start_row - first_row] * scale)
+            bottom = round(offsets[end_row - first_row + 1] * scale)
+            return image.crop((0, top, image.width, bottom))
+
+        header = None
+        if header_index >= first_row:
+            header = crop_rows(first_row, min(header_index, last_row))
+
+        for start_row in range(max(header_index + 1, first_row), last_row + 1, rows_per_file):
+            end_row = min(start_row + rows_per_file - 1, last_row)
+            body = crop_rows(start_row, end_row)
+            header_height = header.height if header is not None else 0
+            part = Image.new("RGB", (image.width, header_height + body.height), "white")
+            if header is not None:
+                part.paste(header, (0, 0))
+            part.paste(body, (0, header_height))
+
+            output_file = os.path.join(
+                output_dir, f"{sheet_name}_rows_{start_row}_to_{end_row}.png"
+            )
+            part.save(output_file)
+            image_files.append(output_file)
+            logger.debug("已保存: %s", output_file)
+
+    return image_files
 
 # 格式化目录下所有Excel文件
-def format_excel_files_in_directory(directory):
+def format_excel_files_in_directory(directory, app=None):
     """
     给目录下的所有Excel文件添加全部框线，并调整列宽以防止数据被遮挡。
 
     参数：
         directory (str): 包含Excel文件的目录路径。
+        app (xw.App): 共享的Excel实例，为空时临时启动一个。
 
     返回：
-        None
+        list: 格式化成功的文件路径列表。
     """
     import os
 
     # 遍历目录中的所有Excel文件
     file_paths = []
-    app = xw.App(visible=False)
+    app, release_app = acquire_excel_app(app)
     try:
-        for file_name in os.listdir(directory):
-            if file_name.endswith(".xlsx"):
-                file_path = os.path.join(directory, file_name)
-
-                try:
-                    # 加载工作簿
-                    wb = app.books.open(file_path)
-
-                    for sheet in wb.sheets:
-                        # 获取使用范围
-                        used_range = sheet.used_range
-
-                        # 调整列宽
-                        for col_idx in range(1, used_range.columns.count + 1):
-                            col_letter = xw.utils.col_name(col_idx)
-                            col_range = sheet.range(f"{col_letter}:{col_letter}")
-                            max_length = 0
-
-                            for cell in col_range[:used_range.rows.count]:
-                                if cell.value:
-                                    max_length = max(max_length, len(str(cell.value)))
-
-                            adjusted_width = (max_length + 2) * 1.2  # 调整宽度
-                            sheet.range(f"{col_letter}:{col_letter}").column_width = adjusted_width
-
-                        # xlwings 添加边框需要通过 API 对象
-                        # 为整个使用范围添加边框
-                        used_range.api.Borders.LineStyle = 1  # 1 表示实线边框
-
-                    # 保存修改
-                    wb.save(file_path)
-                    wb.close()
-                    file_paths.append(file_path)
-                    print(f"已格式化: {file_path}")
-                except Exception as e:
-                    print(f"格式化文件时出错: {file_path}, 错误: {e}")
+        # scandir 的目录项自带文件名和类型，无需再拼接路径和查询文件状态
+        with os.scandir(directory) as entries:
+            excel_files = [
+                entry.path
+                for entry in entries
+                if entry.name.endswith(".xlsx") and entry.is_file(follow_symlinks=False)
+            ]
+        for file_path in excel_files:
+            try:
+                # 加载工作簿
+                wb = app.books.open(file_path)
+
+                for sheet in wb.sheets:
+                    # 获取使用范围
+                    used_range = sheet.used_range
+
+                    # 调整列宽
+                    for col_idx in range(1, used_range.columns.count + 1):
+                        col_letter = xw.utils.col_name(col_idx)
+                        col_range = sheet.range(f"{col_letter}:{col_letter}")
+                        max_length = 0
+
+                        for cell in col_range[:used_range.rows.count]:
+                            if cell.value:
+                                max_length = max(max_length, len(str(cell.value)))
+
+                        adjusted_width = (max_length + 2) * 1.2  # 调整宽度
+                        sheet.range(f"{col_letter}:{col_letter}").column_width = adjusted_width
+
+                    # xlwings 添加边框需要通过 API 对象
+                    # 为整个使用范围添加边框
+                    used_range.api.Borders.LineStyle = 1  # 1 表示实线边框
+
+                # 保存修改
+                wb.save(file_path)
+                wb.close()
+                file_paths.append(file_path)
+                print(f"已格式化: {file_path}")
+            except Exception as e:
+                print(f"格式化文件时出错: {file_path}, 错误: {e}")
     finally:
-        app.quit()
+        release_app()
 
     return file_paths
 
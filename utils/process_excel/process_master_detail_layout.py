@@ -2,18 +2,21 @@ import os
 
 import xlwings as xw
 
+from utils.process_excel.excel_process import acquire_excel_app
+
 # 获取Excel文件的行数
-def get_excel_row_count(input_file: str) -> int | None:
+def get_excel_row_count(input_file: str, app=None) -> int | None:
     """
     获取Excel文件中第一个工作表的行数
     
     参数：
         input_file (str): Excel文件路径
+        app (xw.App): 共享的Excel实例，为空时临时启动一个。
         
     返回：
         int: 工作表的行数
     """
-    app = xw.App(visible=False)
+    app, release_app = acquire_excel_app(app)
     try:
         # 打开工作簿
         wb = app.books.open(input_file)
@@ -21,8 +24,8 @@ def get_excel_row_count(input_file: str) -> int | None:
         sheet = wb.sheets[0]
         # 获取使用的范围
         used_range = sheet.used_range
-        # 获取行数
-        if used_range.value:
+        # 获取行数；多个单元格的范围必然有内容，单个单元格时才读取其值，避免读入整张表
+        if used_range.count > 1 or used_range.value:
             row_count = used_range.rows.count
         else:
             row_count = 0
@@ -33,10 +36,10 @@ def get_excel_row_count(input_file: str) -> int | None:
         print(f"获取Excel行数时出错: {e}")
         raise
     finally:
-        app.quit()
+        release_app()
 
 # 按行切分Excel
-def split_excel_by_rows(file_path, output_dir, rows_per_file=10):
+def split_excel_by_rows(file_path, output_dir, rows_per_file=10, app=None):
     """
     将Excel表格按行切分，每`rows_per_file`行切分成一个新的Excel文件。
     保留原始格式（字体、颜色、边框、列宽、行高等）。
@@ -45,15 +48,17 @@ def split_excel_by_rows(file_path, output_dir, rows_per_file=10):
         file_path (str): 输入Excel文件的路径。
         output_dir (str): 输出文件的目录。
         rows_per_file (int): 每个文件包含的行数，默认为10。
+        app (xw.App): 共享的Excel实例，为空时临时启动一个。
 
     返回：
-        None
+        list: 按起始行顺序保存的文件路径列表。
     """
     # 确保输出目录存在
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    app = xw.App(visible=False)
+    output_files = []
+    app, release_app = acquire_excel_app(app)
     try:
         # 加载工作簿
         wb = app.books.open(file_path)
@@ -100,13 +105,15 @@ def split_excel_by_rows(file_path, output_dir, rows_per_file=10):
             )
             new_wb.save(output_file)
             new_wb.close()
+            output_files.append(output_file)
             print(f"已保存: {output_file}（已保留格式）")
 
         wb.close()
     except Exception as e:
         print(f"切分Excel文件时出错: {e}")
     finally:
-        app.quit()
+        release_app()
+    return output_files
 
 if __name__ == "__main__":
     print('Excel处理工具模块已加载')
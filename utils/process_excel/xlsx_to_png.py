@@ -0,0 +1,66 @@
+"""
+使用 Spire.XLS 在进程内将 Excel 工作表渲染为图片
+无需启动 Excel 进程，适用于只需要表格截图的场景
+"""
+import logging
+import os
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+
+# 将单个Excel文件的第一个工作表渲染为图片
+def render_sheet_to_png(input_file: str, output_file: str) -> None:
+    """
+    将Excel文件第一个工作表的已用区域渲染为PNG图片。
+    未授权的 Spire.XLS 会在图片上加入评估版水印，见 config.EXCEL_IMAGE_RENDERER 的说明。
+
+    参数：
+        input_file (str): 输入Excel文件路径。
+        output_file (str): 输出图片路径。
+
+    返回：
+        None
+    """
+    from spire.xls import Workbook
+
+    workbook = Workbook()
+    try:
+        workbook.LoadFromFile(input_file)
+        sheet = workbook.Worksheets[0]
+        image = sheet.ToImage(
+            sheet.FirstRow, sheet.FirstColumn, sheet.LastRow, sheet.LastColumn
+        )
+        image.Save(output_file)
+    finally:
+        workbook.Dispose()
+
+
+# 批量将Excel文件渲染为图片
+def convert_excel_to_images_batch(files: List[str], out_dir: str) -> List[str]:
+    """
+    将多个Excel文件逐个渲染为图片，图片名与Excel文件名相同。
+
+    参数：
+        files (list): Excel文件路径列表。
+        out_dir (str): 保存图片的目录。
+
+    返回：
+        成功生成的图片路径列表
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    image_files = []
+    for input_file in files:
+        if not input_file.endswith(".xlsx"):
+            continue
+        output_file = os.path.join(
+            out_dir, f"{os.path.splitext(os.path.basename(input_file))[0]}.png"
+        )
+        try:
+            render_sheet_to_png(input_file, output_file)
+            image_files.append(output_file)
+            logger.debug("已将 '%s' 转换为 '%s'", input_file, output_file)
+        except Exception as e:
+            logger.debug("转换 '%s' 时出错: %s", input_file, e)
+    return image_files
@@ -513,8 +513,9 @@ class TableCorrector:
                 file_name = Path(corrected_file).stem
                 self.status_callback(f"正在提取结构化数据: {file_name}...")
 
-            temp = extract_info_from_md(corrected_file)
-            extracted_info = json.loads(temp).get("费用明细", [])
+            result = extract_info_from_md(corrected_file)
+            # 模型可能返回列表或空内容，只有字典才包含费用明细
+            extracted_info = result.get("费用明细", []) if isinstance(result, dict) else []
             print(f"异步提取完成: {corrected_file}, 条数: {len(extracted_info)}")
 
             # 发送完成状态
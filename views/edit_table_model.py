@@ -0,0 +1,233 @@
+"""
+编辑界面表格模型
+以行字典列表作为数据源，只在单元格可见时才生成显示内容
+"""
+from typing import List, Dict, Any
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal
+from PySide6.QtGui import QBrush, QColor, QFont
+
+from config.config import EXTRA_FIELD
+
+# 表格字段，元组便于在填充循环中快速迭代
+_FIELDS = tuple(EXTRA_FIELD)
+# 新增行的背景色
+NEW_ROW_COLOR = "#FFF9C4"
+# 单元格标志固定不变，只计算一次
+_CELL_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+# 源文件列的文字颜色，所有模型共用
+_SOURCE_FILE_BRUSH = QBrush(Qt.blue)
+
+
+def _normalize_row(data_row: Dict[str, Any], fields=_FIELDS, str_=str) -> Dict[str, str]:
+    """按表格字段提取一行数据并转换为去除首尾空白的字符串"""
+    get = data_row.get
+    return {field: str_(get(field, "")).strip() for field in fields}
+
+
+class EditTableModel(QAbstractTableModel):
+    """编辑表格数据模型
+
+    每一行是一个以 EXTRA_FIELD 为键的字典，且总是包含全部字段，背景色按行保存。
+    视图只会为可见的单元格调用 data()，不再为每个单元格创建表格项。
+    """
+
+    # 用户通过界面修改单元格时发出：行号、列号、原值、新值
+    cell_edited = Signal(int, int, str, str)
+
+    def __init__(self, parent=None):
+        """初始化表格模型
+
+        Args:
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._fields = _FIELDS
+        self._rows: List[Dict[str, str]] = []
+        # 每行的背景画刷，同色行共享同一个 QBrush
+        self._row_brushes: List[QBrush] = []
+        self._brushes: Dict[str, QBrush] = {}
+        self._source_col = (
+            self._fields.index("源文件") if "源文件" in self._fields else -1
+        )
+        # QFont 需在 QApplication 创建后构造，因此随模型创建一次
+        self._source_font = QFont()
+        self._source_font.setUnderline(True)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """返回行数"""
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """返回列数"""
+        if parent.isValid():
+            return 0
+        return len(self._fields)
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole) -> Any:
+        """返回表头内容"""
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._fields[section]
+        return section + 1
+
+    def flags(self, index: QModelIndex):
+        """所有单元格均可选中和编辑"""
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return _CELL_FLAGS
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole) -> Any:
+        """返回单元格在指定角色下的数据"""
+        if not index.isValid():
+            return None
+        row = index.row()
+        col = index.column()
+
+        if role == Qt.DisplayRole or role == Qt.EditRole:
+            return self._rows[row][self._fields[col]]
+        if role == Qt.BackgroundRole:
+            return self._row_brushes[row]
+        if col == self._source_col:
+            if role == Qt.FontRole:
+                return self._source_font
+            if role == Qt.ForegroundRole:
+                return _SOURCE_FILE_BRUSH
+        return None
+
+    def setData(self, index: QModelIndex, value: Any, role=Qt.EditRole) -> bool:
+        """界面编辑单元格后写回行数据"""
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        row = index.row()
+        col = index.column()
+        field = self._fields[col]
+        old_value = self._rows[row][field]
+        new_value = "" if value is None else str(value).strip()
+        if old_value == new_value:
+            return False
+
+        self._rows[row][field] = new_value
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        self.cell_edited.emit(row, col, old_value, new_value)
+        return True
+
+    def insertRows(
+            self, row: int, count: int, parent: QModelIndex = QModelIndex(),
+            color: str = NEW_ROW_COLOR,
+    ) -> bool:
+        """在指定位置插入空行
+
+        Args:
+            row: 插入位置
+            count: 插入行数
+            parent: 父索引
+            color: 新增行背景色
+        """
+        if count <= 0 or row < 0 or row > len(self._rows):
+            return False
+        self.beginInsertRows(QModelIndex(), row, row + count - 1)
+        self._rows[row:row] = [dict.fromkeys(self._fields, "") for _ in range(count)]
+        self._row_brushes[row:row] = [self._brush(color)] * count
+        self.endInsertRows()
+        return True
+
+    def removeRows(self, row: int, count: int, parent: QModelIndex = QModelIndex()) -> bool:
+        """删除从指定位置开始的若干行"""
+        if count <= 0 or row < 0 or row + count > len(self._rows):
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        del self._rows[row:row + count]
+        del self._row_brushes[row:row + count]
+        self.endRemoveRows()
+        return True
+
+    def set_rows(self, data_list: List[Dict[str, Any]], row_colors: List[str]) -> None:
+        """整体替换表格数据
+
+        Args:
+            data_list: 数据列表
+            row_colors: 与数据行一一对应的背景色
+        """
+        self.beginResetModel()
+        self._rows = [_normalize_row(data_row) for data_row in data_list]
+        brush = self._brush
+        self._row_brushes = [brush(color) for color in row_colors]
+        self.endResetModel()
+
+    def rows(self) -> List[Dict[str, str]]:
+        """返回当前所有行数据的副本，外部修改返回的行不会影响模型"""
+        return [dict(data_row) for data_row in self._rows]
+
+    def value(self, row: int, col: int) -> str:
+        """返回指定单元格的值"""
+        return self._rows[row][self._fields[col]]
+
+    def row_values(self, row: int) -> List[str]:
+        """返回指定行所有单元格的值"""
+        data_row = self._rows[row]
+        return [data_row[field] for field in self._fields]
+
+    def field_name(self, col: int) -> str:
+        """返回列对应的字段名"""
+        return self._fields[col]
+
+    def distinct_values(self, cols) -> List[str]:
+        """返回指定列中所有不重复的非空值
+
+        Args:
+            cols: 列号集合
+
+        Returns:
+            排序后的值列表
+        """
+        fields = [self._fields[col] for col in cols]
+        values = {data_row[field] for data_row in self._rows for field in fields}
+        values.discard("")
+        return sorted(values)
+
+    def source_column(self) -> int:
+        """返回源文件列的列号，不存在时为 -1"""
+        return self._source_col
+
+    def set_value(self, row: int, col: int, value: str) -> None:
+        """以程序方式设置单元格的值，不记录为用户编辑
+
+        Args:
+            row: 行号
+            col: 列号
+            value: 新值
+        """
+        self._rows[row][self._fields[col]] = value
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+
+    def write_value(self, row: int, col: int, value: str) -> None:
+        """写入单元格的值但不发出通知
+
+        用于批量修改，由调用方在全部写入后统一发出一次 dataChanged。
+
+        Args:
+            row: 行号
+            col: 列号
+            value: 新值
+        """
+        self._rows[row][self._fields[col]] = value
+
+    def _brush(self, color: str) -> QBrush:
+        """返回指定颜色的画刷，每种颜色只创建一次
+
+        Args:
+            color: 十六进制颜色
+
+        Returns:
+            缓存的画刷
+        """
+        brush = self._brushes.get(color)
+        if brush is None:
+            brush = QBrush(QColor(color))
+            self._brushes[color] = brush
+        return brush
@@ -3,12 +3,13 @@
 用户在此界面查看和编辑识别后的数据
 """
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                             QPushButton, QTableWidget, QMenu,
+                             QPushButton, QTableView, QMenu,
                              QHeaderView, QApplication, QLineEdit,
                              QAbstractItemView)
 from PySide6.QtCore import Signal, Qt
 from PySide6.QtGui import QIcon
 from styles import StyleManager
+from views.edit_table_model import EditTableModel
 import sys
 import os
 
@@ -57,16 +58,22 @@ class EditView(QWidget):
         StyleManager.apply_label_style(self.table_label, 'subtitle')
         main_layout.addWidget(self.table_label)
 
-        # 创建表格
-        self.data_table = QTableWidget()
+        # 创建表格，数据由表格模型提供
+        self.table_model = EditTableModel(self)
+        self.data_table = QTableView()
+        self.data_table.setModel(self.table_model)
         self.data_table.setAlternatingRowColors(True)
         self.data_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # 固定行高，避免按内容逐行测量高度
+        vertical_header = self.data_table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        vertical_header.setDefaultSectionSize(30)
         # 设置为整行选择
         self.data_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         # 默认设置为不可编辑
         self.data_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.data_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 gridline-color: #ddd;
                 border: 1px solid #ccc;
             }